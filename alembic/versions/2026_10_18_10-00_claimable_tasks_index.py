@@ -0,0 +1,35 @@
+"""Partial index for claiming created tasks
+
+Revision ID: b77f603ef02d
+Revises: fa335879b54f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b77f603ef02d"
+down_revision: Union[str, Sequence[str], None] = "fa335879b54f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_claimable",
+        "tasks",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'CREATED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_claimable", table_name="tasks")
@@ -0,0 +1,48 @@
+"""Add composite indexes for task list filters and sorting
+
+Revision ID: 5c2e9a41d7f3
+Revises: 1d1b195b4db4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e9a41d7f3"
+down_revision: Union[str, Sequence[str], None] = "1d1b195b4db4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f("ix_tasks_title"), table_name="tasks")
+    op.create_index("ix_tasks_title_id", "tasks", ["title", "id"])
+    op.create_index("ix_tasks_status_id", "tasks", ["status", "id"])
+    op.create_index(
+        "ix_tasks_status_title_id", "tasks", ["status", "title", "id"]
+    )
+    # claim читает (status = 'CREATED', id) из ix_tasks_status_id так же,
+    # как из частичного индекса, а лишний индекс обновлялся бы при каждой
+    # записи в tasks.
+    op.drop_index("ix_tasks_claimable", table_name="tasks")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_tasks_claimable",
+        "tasks",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'CREATED'"),
+    )
+    op.drop_index("ix_tasks_status_title_id", table_name="tasks")
+    op.drop_index("ix_tasks_status_id", table_name="tasks")
+    op.drop_index("ix_tasks_title_id", table_name="tasks")
+    op.create_index(op.f("ix_tasks_title"), "tasks", ["title"], unique=False)
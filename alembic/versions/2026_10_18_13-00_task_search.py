@@ -0,0 +1,59 @@
+"""Add full-text and trigram search on tasks
+
+Revision ID: 9e4b17c0a2d8
+Revises: 5c2e9a41d7f3
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b17c0a2d8"
+down_revision: Union[str, Sequence[str], None] = "5c2e9a41d7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_tasks_search_vector",
+        "tasks",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_tasks_title_trgm",
+        "tasks",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_title_trgm", table_name="tasks")
+    op.drop_index("ix_tasks_search_vector", table_name="tasks")
+    op.drop_column("tasks", "search_vector")
@@ -0,0 +1,34 @@
+"""Add covering index for title prefix suggestions
+
+Revision ID: 3f8d62b9e1a5
+Revises: 9e4b17c0a2d8
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8d62b9e1a5"
+down_revision: Union[str, Sequence[str], None] = "9e4b17c0a2d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_title_prefix",
+        "tasks",
+        [sa.text('lower(title) COLLATE "C"'), "id"],
+        postgresql_include=["title"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_title_prefix", table_name="tasks")
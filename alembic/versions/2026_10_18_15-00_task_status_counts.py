@@ -0,0 +1,100 @@
+"""Add per-status task counters maintained by triggers
+
+Revision ID: 6a0c3d8e4f21
+Revises: 3f8d62b9e1a5
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a0c3d8e4f21"
+down_revision: Union[str, Sequence[str], None] = "3f8d62b9e1a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Изменения пишутся в случайный из 16 шардов счётчика статуса.
+APPLY_FUNCTION = """
+CREATE FUNCTION task_status_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), count(*)
+        FROM new_rows
+        GROUP BY status
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), -count(*)
+        FROM old_rows
+        GROUP BY status
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    ELSE
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), sum(delta)
+        FROM (
+            SELECT status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT status, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY status
+        HAVING sum(delta) <> 0
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "insert": "REFERENCING NEW TABLE AS new_rows",
+    "update": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_status_counts",
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="task_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "shard"),
+    )
+    op.execute(APPLY_FUNCTION)
+    # Без записей в tasks до конца миграции: начальные значения и
+    # триггеры видят одно и то же состояние таблицы.
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    for event, referencing in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER tasks_status_counts_{event} "
+            f"AFTER {event.upper()} ON tasks {referencing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_apply()"
+        )
+    op.execute(
+        "INSERT INTO task_status_counts (status, shard, count) "
+        "SELECT status, 0, count(*) FROM tasks GROUP BY status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for event in TRIGGERS:
+        op.execute(f"DROP TRIGGER tasks_status_counts_{event} ON tasks")
+    op.execute("DROP FUNCTION task_status_counts_apply()")
+    op.drop_table("task_status_counts")
@@ -1,17 +1,107 @@
 import uuid
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import DEFAULT_PAGE_SIZE
-from app.db.db import get_async_session
-from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
-from app.services.task_service import TaskService
-from app.utils.pagination import Page
+from app.core.config import settings
+from app.core.constants import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUGGEST_LIMIT,
+    MAX_BULK_ITEMS,
+    MAX_IMPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_LENGTH,
+    MAX_SUGGEST_LIMIT,
+    TITLE_MAX_LENGTH,
+)
+from app.db.db import (
+    get_async_session,
+    get_read_session,
+    get_read_session_factory,
+)
+from app.db.enums import SortOrder, TaskSortField, TaskStatus, TotalMode
+from app.schemas.task import (
+    TaskBatchGet,
+    TaskBatchGetResult,
+    TaskBulkCreateResult,
+    TaskBulkDelete,
+    TaskBulkDeleteResult,
+    TaskBulkItemResult,
+    TaskCreate,
+    TaskImportReport,
+    TaskOut,
+    TaskOutList,
+    TaskStats,
+    TaskSuggestion,
+    TaskTransition,
+    TaskTransitionResult,
+    TaskUpdate,
+)
+from app.services.task_service import TaskService, VersionConflictError
+from app.services.task_stats_service import TaskStatsService
+from app.utils.etag import (
+    collection_etag,
+    etag_matches,
+    parse_if_match,
+    version_etag,
+)
+from app.utils.export import (
+    EXPORT_FIELDS,
+    MEDIA_TYPES,
+    DataFormat,
+    parse_fields,
+)
+from app.utils.importing import iter_records
+from app.utils.pagination import InvalidCursorError, Page
+from app.utils.responses import ModelResponse
 
 router = APIRouter()
 
 
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
+def _task_fields(
+    fields: str | None = Query(
+        None,
+        description="Поля задачи через запятую (id, title, description, "
+        "status, version); id возвращается всегда, по умолчанию — все",
+    ),
+) -> tuple[str, ...]:
+    """Поля задач, которые нужно прочитать и вернуть (параметр fields)."""
+    if fields is None:
+        return EXPORT_FIELDS
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестные поля: {e}",
+        ) from None
+
+
+def _omitted(fields: tuple[str, ...]) -> set[str] | None:
+    return set(EXPORT_FIELDS).difference(fields) or None
+
+
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
 async def create_task(
     payload: TaskCreate, db: AsyncSession = Depends(get_async_session)
@@ -22,33 +112,377 @@ async def create_task(
     return TaskOut.model_validate(task)
 
 
+@router.post(
+    "/bulk",
+    response_model=TaskBulkCreateResult,
+    # Тело разбирается как список произвольных значений, чтобы проверять
+    # элементы по одному; в схеме OpenAPI остаётся массив TaskCreate.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/TaskCreate"},
+                        "minItems": 1,
+                        "maxItems": MAX_BULK_ITEMS,
+                    }
+                }
+            },
+        }
+    },
+)
+async def bulk_create_tasks(
+    payload: list[Any] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Создать пачку задач.
+
+    Каждый элемент проверяется отдельно: невалидные попадают в отчёт с
+    ошибками, остальные записываются в одной транзакции.
+    """
+    results: list[TaskBulkItemResult] = []
+    valid: list[tuple[int, TaskCreate]] = []
+    for index, item in enumerate(payload):
+        try:
+            valid.append((index, TaskCreate.model_validate(item)))
+        except ValidationError as e:
+            results.append(
+                TaskBulkItemResult(
+                    index=index,
+                    ok=False,
+                    errors=e.errors(
+                        include_url=False,
+                        include_context=False,
+                        include_input=False,
+                    ),
+                )
+            )
+    if valid:
+        task_service = TaskService(db)
+        tasks = await task_service.create_many([data for _, data in valid])
+        results.extend(
+            TaskBulkItemResult(
+                index=index, ok=True, task=TaskOut.model_validate(task)
+            )
+            for (index, _), task in zip(valid, tasks, strict=True)
+        )
+    results.sort(key=lambda r: r.index)
+    return TaskBulkCreateResult(
+        created=len(valid),
+        failed=len(payload) - len(valid),
+        items=results,
+    )
+
+
+@router.post("/transition", response_model=TaskTransitionResult)
+async def transition_tasks(
+    payload: TaskTransition, db: AsyncSession = Depends(get_async_session)
+):
+    """Перевести пачку задач в новый статус.
+
+    С expected_status переход атомарно применяется только к задачам в
+    этом статусе, остальные id возвращаются в skipped. Без ids за запрос
+    переводится не больше limit задач; если updated заполнен целиком,
+    запрос стоит повторить.
+    """
+    ids = list(dict.fromkeys(payload.ids)) if payload.ids else None
+    task_service = TaskService(db)
+    tasks = await task_service.transition(
+        payload.status,
+        ids=ids,
+        expected_status=payload.expected_status,
+        limit=payload.limit,
+    )
+    updated = [TaskOut.model_validate(t) for t in tasks]
+    done = {t.id for t in updated}
+    return TaskTransitionResult(
+        updated=updated,
+        skipped=[i for i in ids or () if i not in done],
+    )
+
+
+@router.post("/claim", response_model=list[TaskOut])
+async def claim_tasks(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Атомарно взять в работу до limit задач в статусе «Создано»."""
+    task_service = TaskService(db)
+    tasks = await task_service.claim(limit)
+    return [TaskOut.model_validate(t) for t in tasks]
+
+
+@router.post("/batch-get", response_model=TaskBatchGetResult)
+async def batch_get_tasks(
+    payload: TaskBatchGet,
+    fields: tuple[str, ...] = Depends(_task_fields),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Получить задачи по списку UUID одним запросом.
+
+    Задачи из кэша не читаются из БД, остальные выбираются одним
+    WHERE id = ANY(...). Порядок items совпадает с порядком ids (повторы
+    убираются), отсутствующие id перечислены в not_found.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    task_service = TaskService(db)
+    found = await task_service.get_many(
+        ids, description="description" in fields
+    )
+    result = TaskBatchGetResult(
+        items=TaskOutList.validate_python(
+            [found[i] for i in ids if i in found]
+        ),
+        not_found=[i for i in ids if i not in found],
+    )
+    omitted = _omitted(fields)
+    return ModelResponse(
+        result,
+        exclude={"items": {"__all__": omitted}} if omitted else None,
+    )
+
+
+@router.get("/stats", response_model=TaskStats)
+async def task_stats(db: AsyncSession = Depends(get_read_session)):
+    """Число задач по статусам из счётчиков, без подсчёта строк."""
+    stats_service = TaskStatsService(db)
+    return await stats_service.get()
+
+
+@router.get("/suggest", response_model=list[TaskSuggestion])
+async def suggest_tasks(
+    prefix: str = Query(
+        ...,
+        min_length=1,
+        max_length=TITLE_MAX_LENGTH,
+        description="Начало названия задачи",
+    ),
+    limit: int = Query(DEFAULT_SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Подсказки названий задач по мере набора (id и title)."""
+    task_service = TaskService(db)
+    return await task_service.suggest(prefix, limit=limit)
+
+
+@router.get("/search", response_model=Page[TaskOut])
+async def search_tasks(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=MAX_SEARCH_LENGTH,
+        description="Слова для поиска по названию и описанию",
+    ),
+    cursor: str | None = Query(
+        None, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Полнотекстовый поиск задач, самые релевантные — первыми.
+
+    Слова ищутся как префиксы; если совпадений нет, выполняется нечёткий
+    поиск по названию, устойчивый к опечаткам.
+    """
+    task_service = TaskService(db)
+    try:
+        tasks, next_cursor = await task_service.search(
+            q, cursor=cursor, page_size=page_size
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор",
+        ) from None
+    return ModelResponse(
+        Page[TaskOut](
+            items=TaskOutList.validate_python(tasks),
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_next=next_cursor is not None,
+        )
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    task_status: TaskStatus | None = Query(None, alias="status"),
+    fields: tuple[str, ...] = Depends(_task_fields),
+    session_factory: Callable[
+        [], AbstractAsyncContextManager[AsyncSession]
+    ] = Depends(get_read_session_factory),
+):
+    """Потоковая выгрузка задач в NDJSON или CSV.
+
+    fields ограничивает поля (и колонки CSV); без description описания
+    задач не читаются из БД.
+    """
+
+    async def body():
+        async with session_factory() as db:
+            chunks = TaskService(db).export(fmt, task_status, fields=fields)
+            async for chunk in chunks:
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{fmt.value}"'
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportReport,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    fmt: DataFormat = Query(DataFormat.NDJSON, alias="format"),
+    batch_size: int | None = Query(None, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Массовая загрузка задач из NDJSON или CSV через COPY.
+
+    Тело запроса читается потоком и пишется пачками; в отчёте указаны
+    ошибки по каждой пачке и скорость загрузки.
+    """
+    task_service = TaskService(db)
+    return await task_service.import_tasks(
+        iter_records(fmt, request.stream(), settings.import_max_line_bytes),
+        batch_size=batch_size,
+    )
+
+
 @router.get("/{task_id}", response_model=TaskOut)
 async def get_task(
-    task_id: uuid.UUID, db: AsyncSession = Depends(get_async_session)
+    task_id: uuid.UUID,
+    fields: tuple[str, ...] = Depends(_task_fields),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    """Получить задачу по UUID."""
+    """Получить задачу по UUID.
+
+    С If-None-Match сначала сверяется только версия задачи: при
+    совпадении возвращается 304 без чтения и сериализации строки.
+    fields ограничивает поля ответа; без description описание не
+    читается из БД.
+    """
     task_service = TaskService(db)
-    task = await task_service.get(task_id)
+    if if_none_match:
+        version = await task_service.get_version(task_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задача не найдена",
+            )
+        etag = version_etag(version)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+    task = await task_service.get(task_id, description="description" in fields)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена"
         )
-    return TaskOut.model_validate(task)
+    out = TaskOut.model_validate(task)
+    headers = {}
+    if out.version is not None:
+        headers["ETag"] = version_etag(out.version)
+    return ModelResponse(out, exclude=_omitted(fields), headers=headers)
 
 
 @router.get("/", response_model=Page[TaskOut])
 async def list_tasks(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=200),
-    db: AsyncSession = Depends(get_async_session),
+    page: int | None = Query(
+        None, ge=1, description="Номер страницы (устаревший режим OFFSET)"
+    ),
+    cursor: str | None = Query(
+        None, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    task_status: TaskStatus | None = Query(
+        None, alias="status", description="Фильтр по статусу"
+    ),
+    sort: TaskSortField = Query(
+        TaskSortField.ID, description="Поле сортировки"
+    ),
+    order: SortOrder = Query(SortOrder.ASC, description="Направление"),
+    with_total: TotalMode = Query(
+        TotalMode.NONE,
+        description="Вернуть total: точно (exact) или оценкой (estimate)",
+    ),
+    fields: tuple[str, ...] = Depends(_task_fields),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    """Список задач с пагинацией."""
+    """Список задач с фильтром по статусу, сортировкой и пагинацией.
+
+    По умолчанию используется keyset-пагинация по курсору; параметр page
+    оставлен для совместимости со старыми клиентами. Курсор привязан к
+    сортировке, с которой он выдан. ETag страницы считается по id и
+    версиям задач и по total, если он запрошен. fields ограничивает поля
+    задач; без description описания не читаются из БД.
+    """
     task_service = TaskService(db)
-    tasks = await task_service.list(page=page, page_size=page_size)
-    return Page[TaskOut](
-        items=[TaskOut.model_validate(t) for t in tasks],
-        page=page,
-        page_size=page_size,
+    query = {
+        "status": task_status,
+        "sort": sort,
+        "order": order,
+        "description": "description" in fields,
+    }
+    if page is not None and cursor is None:
+        tasks = await task_service.list(
+            page=page, page_size=page_size, **query
+        )
+        result = Page[TaskOut](
+            items=TaskOutList.validate_python(tasks),
+            page=page,
+            page_size=page_size,
+        )
+    else:
+        try:
+            tasks, next_cursor = await task_service.list_after(
+                cursor=cursor, page_size=page_size, **query
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Некорректный курсор",
+            ) from None
+        result = Page[TaskOut](
+            items=TaskOutList.validate_python(tasks),
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_next=next_cursor is not None,
+        )
+    if with_total is not TotalMode.NONE:
+        stats_service = TaskStatsService(db)
+        result.total = await stats_service.total(task_status, with_total)
+        result.total_estimated = with_total is TotalMode.ESTIMATE
+    etag = collection_etag(
+        [(t.id, t.version) for t in result.items]
+        + [result.next_cursor, result.total]
+    )
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    omitted = _omitted(fields)
+    return ModelResponse(
+        result,
+        exclude={"items": {"__all__": omitted}} if omitted else None,
+        headers={"ETag": etag},
     )
 
 
@@ -56,16 +490,39 @@ async def list_tasks(
 async def update_task(
     task_id: uuid.UUID,
     payload: TaskUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     db: AsyncSession = Depends(get_async_session),
 ):
-    """Частично обновить задачу."""
+    """Частично обновить задачу.
+
+    If-Match с ETag задачи (или их списком) превращает запрос в условный
+    UPDATE по версии: если задачу успели изменить, возвращается 412.
+    """
+    expected_versions = parse_if_match(if_match) if if_match else None
+    if expected_versions == []:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Версия задачи изменилась",
+        )
     task_service = TaskService(db)
-    task = await task_service.update(task_id, payload)
+    try:
+        task = await task_service.update(
+            task_id, payload, expected_versions=expected_versions
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Версия задачи изменилась",
+        ) from None
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена"
         )
-    return TaskOut.model_validate(task)
+    out = TaskOut.model_validate(task)
+    if out.version is not None:
+        response.headers["ETag"] = version_etag(out.version)
+    return out
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -80,3 +537,17 @@ async def delete_task(
             status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена"
         )
     return None
+
+
+@router.delete("/", response_model=TaskBulkDeleteResult)
+async def bulk_delete_tasks(
+    payload: TaskBulkDelete, db: AsyncSession = Depends(get_async_session)
+):
+    """Удалить задачи по списку UUID одним запросом."""
+    ids = list(dict.fromkeys(payload.ids))
+    task_service = TaskService(db)
+    deleted = set(await task_service.delete_many(ids))
+    return TaskBulkDeleteResult(
+        deleted=[i for i in ids if i in deleted],
+        not_found=[i for i in ids if i not in deleted],
+    )
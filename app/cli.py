@@ -0,0 +1,110 @@
+"""Консольные команды сервиса.
+
+Пример: python -m app.cli import-tasks tasks.ndjson --batch-size 10000
+        python -m app.cli reconcile-stats
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.db import AsyncSessionLocal
+from app.db.enums import TaskStatus
+from app.schemas.task import TaskImportBatch, TaskImportReport
+from app.services.task_service import TaskService
+from app.services.task_stats_service import TaskStatsService
+from app.utils.export import DataFormat
+from app.utils.importing import iter_records
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+def print_progress(batch: TaskImportBatch, report: TaskImportReport) -> None:
+    status = f"ошибка записи: {batch.error}" if batch.error else "ok"
+    print(
+        f"пачка {batch.index}: {batch.inserted}/{batch.rows} ({status}); "
+        f"всего {report.inserted}/{report.rows}, "
+        f"{report.rows_per_second:.0f} строк/с"
+    )
+    for row in batch.errors:
+        print(f"  строка {row.line}: {row.errors}")
+
+
+async def import_tasks(
+    path: Path, fmt: DataFormat, batch_size: int | None
+) -> TaskImportReport:
+    async with AsyncSessionLocal() as db:
+        return await TaskService(db).import_tasks(
+            iter_records(fmt, read_file(path), settings.import_max_line_bytes),
+            batch_size=batch_size,
+            on_batch=print_progress,
+        )
+
+
+async def reconcile_stats() -> dict[TaskStatus, int]:
+    async with AsyncSessionLocal() as db:
+        return await TaskStatsService(db).reconcile()
+
+
+def run_import(args: argparse.Namespace) -> int:
+    fmt = args.fmt or (
+        DataFormat.CSV if args.path.suffix == ".csv" else DataFormat.NDJSON
+    )
+    report = asyncio.run(import_tasks(args.path, fmt, args.batch_size))
+    print(
+        f"Готово: загружено {report.inserted} из {report.rows} строк, "
+        f"отклонено {report.failed}, {report.elapsed:.1f} с, "
+        f"{report.rows_per_second:.0f} строк/с"
+    )
+    return 0 if report.failed == 0 else 1
+
+
+def run_reconcile(args: argparse.Namespace) -> int:  # noqa: ARG001
+    drift = asyncio.run(reconcile_stats())
+    if not drift:
+        print("Счётчики статусов совпадают с таблицей задач")
+    for status, delta in drift.items():
+        print(f"{status.value}: поправка {delta:+d}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-tasks", help="загрузить задачи из NDJSON/CSV через COPY"
+    )
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument(
+        "--format",
+        dest="fmt",
+        type=DataFormat,
+        choices=list(DataFormat),
+        metavar="{" + ",".join(f.value for f in DataFormat) + "}",
+        default=None,
+        help="по умолчанию определяется по расширению файла",
+    )
+    import_parser.add_argument("--batch-size", type=int, default=None)
+    import_parser.set_defaults(handler=run_import)
+
+    reconcile_parser = commands.add_parser(
+        "reconcile-stats",
+        help="сверить счётчики задач по статусам с таблицей и исправить",
+    )
+    reconcile_parser.set_defaults(handler=run_reconcile)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.core.constants import MAX_IMPORT_LINE_BYTES
+
 RUN_IN_DOCKER = os.getenv("IS_DOCKER", "not").lower() == "docker"
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
@@ -19,6 +21,29 @@ class Settings(BaseSettings):
     app_debug: bool = Field(True, alias="APP_DEBUG")
     api_v1_prefix: str = Field("/api/v1", alias="API_V1_PREFIX")
     page_size_default: int = Field(20, alias="PAGE_SIZE_DEFAULT")
+    bulk_batch_size: int = Field(500, ge=1, alias="BULK_BATCH_SIZE")
+    export_chunk_rows: int = Field(1000, ge=1, alias="EXPORT_CHUNK_ROWS")
+    import_batch_size: int = Field(5000, ge=1, alias="IMPORT_BATCH_SIZE")
+    import_max_line_bytes: int = Field(
+        MAX_IMPORT_LINE_BYTES, ge=1, alias="IMPORT_MAX_LINE_BYTES"
+    )
+    group_commit_max_batch: int = Field(
+        0,
+        ge=0,
+        alias="GROUP_COMMIT_MAX_BATCH",
+        description="Максимум созданий в одной транзакции; 0 — выключено",
+    )
+    group_commit_max_delay: float = Field(
+        0.005,
+        gt=0,
+        alias="GROUP_COMMIT_MAX_DELAY",
+        description="Сколько секунд создание может ждать своей пачки",
+    )
+    task_cache_size: int = Field(10_000, ge=0, alias="TASK_CACHE_SIZE")
+    task_cache_ttl: float = Field(30.0, gt=0, alias="TASK_CACHE_TTL")
+    total_cache_ttl: float = Field(5.0, gt=0, alias="TOTAL_CACHE_TTL")
+    suggest_cache_size: int = Field(1000, ge=0, alias="SUGGEST_CACHE_SIZE")
+    suggest_cache_ttl: float = Field(10.0, gt=0, alias="SUGGEST_CACHE_TTL")
 
     postgres_db: str = Field("task_manager", alias="POSTGRES_DB")
     postgres_user: str = Field("postgres", alias="POSTGRES_USER")
@@ -26,6 +51,25 @@ class Settings(BaseSettings):
     postgres_port: str = Field("5432", alias="POSTGRES_PORT")
     db_host: str = Field("localhost", alias="POSTGRES_HOST")
 
+    db_pool_size: int = Field(5, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, gt=0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(-1, ge=-1, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(False, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(
+        100, ge=0, alias="DB_STATEMENT_CACHE_SIZE"
+    )
+
+    db_replica_urls: str = Field(
+        "",
+        alias="DB_REPLICA_URLS",
+        description="DSN реплик для чтения через запятую",
+    )
+    db_replica_cooldown: float = Field(5.0, gt=0, alias="DB_REPLICA_COOLDOWN")
+    read_your_writes_window: float = Field(
+        5.0, ge=0, alias="READ_YOUR_WRITES_WINDOW"
+    )
+
     log_path: str = "app/logs"
 
     model_config = SettingsConfigDict(
@@ -34,6 +78,14 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @property
+    def replica_urls(self) -> list[str]:
+        return [
+            url.strip()
+            for url in self.db_replica_urls.split(",")
+            if url.strip()
+        ]
+
     @property
     def database_url(self) -> str:
         """Формирование строки подключения к базе данных."""
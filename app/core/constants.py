@@ -3,3 +3,14 @@ MAX_PAGE_SIZE = 200
 MIN_PAGE_SIZE = 1
 TITLE_MAX_LENGTH = 200
 TITLE_MIN_LENGTH = 1
+MAX_BULK_ITEMS = 1000
+MAX_BATCH_GET_ITEMS = 500
+MAX_IMPORT_ERRORS_PER_BATCH = 100
+MAX_IMPORT_BATCH_SIZE = 50000
+MAX_IMPORT_LINE_BYTES = 1024 * 1024
+MAX_CSV_RECORD_LINES = 1000
+SEARCH_LANGUAGE = "russian"
+MAX_SEARCH_LENGTH = 200
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 20
+SUGGEST_CACHE_PREFIX_LENGTH = 3
@@ -0,0 +1,52 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+CACHE_REQUESTS = Counter(
+    "app_cache_requests_total",
+    "Обращения к in-process кэшам",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "app_cache_evictions_total",
+    "Вытеснения из in-process кэшей",
+    ["cache", "reason"],
+)
+COALESCED_CALLS = Counter(
+    "app_coalesced_calls_total",
+    "Вызовы, присоединённые к уже выполняющемуся одинаковому запросу",
+    ["group"],
+)
+GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "app_group_commit_batch_size",
+    "Число записей, объединённых в одну транзакцию group commit",
+    ["group"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+
+DB_POOL_SIZE = Gauge(
+    "app_db_pool_size", "Постоянный размер пула соединений с БД", ["engine"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "app_db_pool_checked_out", "Соединения пула, выданные запросам", ["engine"]
+)
+DB_POOL_OVERFLOW = Gauge(
+    "app_db_pool_overflow",
+    "Открытые соединения сверх размера пула",
+    ["engine"],
+)
+DB_POOL_WAIT = Histogram(
+    "app_db_pool_wait_seconds",
+    "Ожидание соединения из пула",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_HOLD = Histogram(
+    "app_db_pool_hold_seconds",
+    "Время, на которое запрос занимает соединение пула",
+    ["engine"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "app_db_pool_timeouts_total",
+    "Запросы, не дождавшиеся соединения за DB_POOL_TIMEOUT",
+    ["engine"],
+)
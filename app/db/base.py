@@ -1,2 +1,3 @@
 from app.db.db import Base  # noqa
 from app.models.task import Task  # noqa
+from app.models.task_status_count import TaskStatusCount  # noqa
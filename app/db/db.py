@@ -1,28 +1,126 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
+from contextlib import AbstractAsyncContextManager
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from starlette.requests import Request
 
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, instrument_pool
+from app.db.replicas import ReplicaRouter, ReplicaSession, prefers_primary
 
 
 class Base(DeclarativeBase):
     """Базовый класс для  моделей."""
 
 
-engine = create_async_engine(settings.database_url, echo=False)
+def _create_engine(url: str, pre_ping: bool) -> AsyncEngine:
+    # statement_cache_size — кэш подготовленных запросов asyncpg,
+    # prepared_statement_cache_size — такой же кэш на стороне SQLAlchemy;
+    # за PgBouncer в режиме transaction оба нужно выключить (0).
+    return create_async_engine(
+        make_url(url).update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.db_statement_cache_size
+                )
+            }
+        ),
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=pre_ping,
+        connect_args={
+            "statement_cache_size": settings.db_statement_cache_size
+        },
+    )
+
+
+engine = _create_engine(settings.database_url, settings.db_pool_pre_ping)
+instrument_pool(engine)
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
+# Чтения выполняются без транзакции: AUTOCOMMIT не отправляет BEGIN перед
+# первым запросом и ROLLBACK при возврате соединения в пул. Соединение
+# при этом занято так же долго: сессия держит его до закрытия в конце
+# запроса. Пул у этих движков общий с основными, меняется только режим
+# выданного соединения.
+READ_ONLY = {"isolation_level": "AUTOCOMMIT"}
+
+ReadSessionLocal = async_sessionmaker(
+    engine.execution_options(**READ_ONLY),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Реплики проверяют соединение при выдаче из пула: иначе после падения
+# реплики её старые соединения давали бы ошибки запросов, а не переход
+# на другую реплику.
+replica_engines = [
+    _create_engine(url, pre_ping=True) for url in settings.replica_urls
+]
+for index, replica in enumerate(replica_engines):
+    instrument_pool(replica, f"replica{index}")
+replica_router = ReplicaRouter(
+    ReadSessionLocal,
+    [
+        async_sessionmaker(
+            replica.execution_options(**READ_ONLY),
+            class_=ReplicaSession,
+            expire_on_commit=False,
+        )
+        for replica in replica_engines
+    ],
+    cooldown=settings.db_replica_cooldown,
+)
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Получение сессии для работы с базой данных."""
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Сессия для чтения вне транзакции (AUTOCOMMIT).
+
+    Берётся с реплики, если она настроена и доступна; клиенты, недавно
+    изменявшие данные, читают из основной БД. Каждый запрос такой сессии
+    видит свой снимок данных, поэтому для записи она не годится.
+    """
+    async with replica_router.session(
+        primary=prefers_primary(request)
+    ) as session:
+        yield session
+
+
+def get_read_session_factory(
+    request: Request,
+) -> Callable[[], AbstractAsyncContextManager[AsyncSession]]:
+    """Фабрика сессий чтения для обработчиков, которым сессия нужна
+    дольше запроса.
+
+    Потоковые ответы читают данные уже после выхода из зависимостей,
+    поэтому открывают сессию сами. Серверному курсору нужна транзакция,
+    поэтому сессия открывается в REPEATABLE READ: вся выгрузка видит
+    один снимок данных.
+    """
+    primary = prefers_primary(request)
+    return lambda: replica_router.session(
+        primary=primary, isolation_level="REPEATABLE READ"
+    )
@@ -5,3 +5,20 @@ class TaskStatus(str, Enum):
     CREATED = "Создано"
     IN_PROGRESS = "В работе"
     COMPLETED = "Завершено"
+
+
+class TaskSortField(str, Enum):
+    ID = "id"
+    TITLE = "title"
+    STATUS = "status"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
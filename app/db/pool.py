@@ -0,0 +1,80 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_HOLD,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+)
+
+CHECKED_OUT_AT = "checked_out_at"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который измеряет ожидание свободного соединения.
+
+    Запросы, которым не хватило соединений, ждут внутри _do_get, поэтому
+    его длительность и есть время в очереди пула. metrics_name — метка
+    engine в метриках; её задаёт instrument_pool.
+    """
+
+    metrics_name = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_name).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_name).observe(
+                time.perf_counter() - started
+            )
+
+
+def _on_checkout(dbapi_connection, record, proxy) -> None:  # noqa: ARG001
+    record.info[CHECKED_OUT_AT] = time.perf_counter()
+
+
+def _hold_observer(name: str):
+    hold = DB_POOL_HOLD.labels(name)
+
+    def on_checkin(dbapi_connection, record) -> None:  # noqa: ARG001
+        started = record.info.pop(CHECKED_OUT_AT, None)
+        if started is not None:
+            hold.observe(time.perf_counter() - started)
+
+    return on_checkin
+
+
+def instrument_pool(engine: AsyncEngine, name: str = "primary") -> None:
+    """Отдавать состояние пула engine в метрики Prometheus с меткой name.
+
+    Gauge читают пул в момент сбора /metrics, поэтому на выдачу
+    соединений они не влияют; пул берётся через engine, чтобы метрики
+    пережили engine.dispose().
+    """
+    sync_engine = engine.sync_engine
+    sync_engine.pool.metrics_name = name
+    DB_POOL_SIZE.labels(name).set_function(lambda: sync_engine.pool.size())
+    DB_POOL_CHECKED_OUT.labels(name).set_function(
+        lambda: sync_engine.pool.checkedout()
+    )
+    DB_POOL_OVERFLOW.labels(name).set_function(
+        lambda: max(sync_engine.pool.overflow(), 0)
+    )
+    event.listen(sync_engine, "checkout", _on_checkout)
+    event.listen(sync_engine, "checkin", _hold_observer(name))
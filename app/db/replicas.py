@@ -0,0 +1,156 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaSession(AsyncSession):
+    """Сессия, открытая на реплике: данные могут отставать от основной БД."""
+
+
+class ReplicaRouter:
+    """Выбор БД для чтения: реплики по кругу, основная — запасной вариант.
+
+    Реплика, к которой не удалось подключиться или соединение с которой
+    оборвалось во время запроса, исключается на cooldown секунд, и её
+    запросы идут на следующую реплику или в основную БД.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[async_sessionmaker[ReplicaSession]],
+        cooldown: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.cooldown = cooldown
+        self._down_until = [0.0] * len(replicas)
+        self._next = itertools.count()
+
+    def _candidates(self) -> list[int]:
+        now = time.monotonic()
+        start = next(self._next)
+        order = (
+            (start + offset) % len(self.replicas)
+            for offset in range(len(self.replicas))
+        )
+        return [i for i in order if self._down_until[i] <= now]
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.cooldown
+
+    def _mark_failed(self, index: int, error: Exception) -> None:
+        self.mark_down(index)
+        logger.warning(
+            "Реплика %s недоступна на %s с: %s", index, self.cooldown, error
+        )
+
+    @asynccontextmanager
+    async def session(
+        self, primary: bool = False, isolation_level: str | None = None
+    ) -> AsyncIterator[AsyncSession]:
+        """Сессия для чтения; primary=True — сразу основная БД.
+
+        Соединение с репликой берётся сразу, чтобы недоступность
+        обнаружилась до запроса, а не в его середине. isolation_level
+        заменяет режим фабрики (по умолчанию AUTOCOMMIT) для этой сессии.
+        """
+        options = (
+            {"isolation_level": isolation_level} if isolation_level else None
+        )
+        if not primary and self.replicas:
+            for index in self._candidates():
+                session = self.replicas[index]()
+                try:
+                    await session.connection(execution_options=options)
+                except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                    await session.close()
+                    self._mark_failed(index, e)
+                    continue
+                async with session:
+                    try:
+                        yield session
+                    except DBAPIError as e:
+                        # Реплика упала, пока запрос шёл: остальные
+                        # запросы не должны попадать на неё до cooldown.
+                        if e.connection_invalidated:
+                            self._mark_failed(index, e)
+                        raise
+                return
+        async with self.primary() as session:
+            if options:
+                await session.connection(execution_options=options)
+            yield session
+
+
+def prefers_primary(request: Request) -> bool:
+    """Клиент недавно изменял данные и должен читать из основной БД."""
+    try:
+        until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+class ReadYourWritesMiddleware:
+    """Cookie read-your-writes после успешного изменяющего запроса.
+
+    Следующие window секунд чтения этого клиента идут в основную БД,
+    поэтому он видит свои изменения, даже если реплики отстают.
+    read_only_paths — пути POST-запросов, которые только читают данные
+    (например, выборка по списку id) и cookie не выставляют.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        window: float,
+        read_only_paths: frozenset[str] = frozenset(),
+    ):
+        self.app = app
+        self.window = window
+        self.read_only_paths = read_only_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or scope["path"] in self.read_only_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; "
+                    "HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"set-cookie", cookie.encode()),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,17 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.api.routes import api_router
+from app.core.config import settings
+from app.db.replicas import ReadYourWritesMiddleware
+from app.services.task_service import flush_pending_creates
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):  # noqa: ARG001
+    yield
+    await flush_pending_creates()
 
 
 def get_application() -> FastAPI:
     app = FastAPI(
         title="Task Manager API",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     app.include_router(api_router, prefix="/api/v1")
 
+    if settings.replica_urls and settings.read_your_writes_window > 0:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window=settings.read_your_writes_window,
+            read_only_paths=frozenset({app.url_path_for("batch_get_tasks")}),
+        )
+
     Instrumentator().instrument(app).expose(app)
 
     return app
@@ -1,13 +1,29 @@
 import uuid as uuid_pkg
 
-from sqlalchemy import Enum, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    DDL,
+    Computed,
+    Enum,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core.constants import TITLE_MAX_LENGTH
+from app.core.constants import SEARCH_LANGUAGE, TITLE_MAX_LENGTH
 from app.db.db import Base
 from app.db.enums import TaskStatus
 
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(title, '')), 'A')"
+    f" || setweight(to_tsvector('{SEARCH_LANGUAGE}', "
+    "coalesce(description, '')), 'B')"
+)
+
 
 class Task(Base):
     """Задача.
@@ -16,15 +32,38 @@ class Task(Base):
     title: название задачи (1..200 символов)
     description: произвольное текстовое описание
     status: статус задачи (created, in_progress, completed)
+    version: номер версии, увеличивается при каждом изменении
+    search_vector: tsvector по title и description для полнотекстового
+    поиска; вычисляется базой, по умолчанию не загружается
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_title_id", "title", "id"),
+        Index(
+            "ix_tasks_title_prefix",
+            text('lower(title) COLLATE "C"'),
+            "id",
+            postgresql_include=["title"],
+        ),
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_status_title_id", "status", "title", "id"),
+        Index(
+            "ix_tasks_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid_pkg.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid_pkg.uuid4
     )
     title: Mapped[str] = mapped_column(
-        String(TITLE_MAX_LENGTH), nullable=False, index=True
+        String(TITLE_MAX_LENGTH), nullable=False
     )
     description: Mapped[str | None] = mapped_column(Text, default=None)
     status: Mapped[TaskStatus] = mapped_column(
@@ -32,3 +71,16 @@ class Task(Base):
         nullable=False,
         default=TaskStatus.CREATED,
     )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
+    )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
+
+event.listen(
+    Task.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
@@ -0,0 +1,95 @@
+from sqlalchemy import DDL, BigInteger, SmallInteger, event
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.db import Base
+from app.db.enums import TaskStatus
+
+
+class TaskStatusCount(Base):
+    """Счётчик задач по статусу, разбитый на шарды.
+    Атрибуты:
+    status: статус задачи
+    shard: номер шарда; триггеры пишут в случайный шард, чтобы
+    параллельные транзакции не ждали друг друга на одной строке
+    count: вклад шарда, итог по статусу — сумма по всем шардам
+    """
+
+    __tablename__ = "task_status_counts"
+
+    status: Mapped[TaskStatus] = mapped_column(
+        ENUM(TaskStatus, name="task_status", create_type=False),
+        primary_key=True,
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+# Те же функция и триггеры, что создаёт миграция 6a0c3d8e4f21: без них
+# таблица, созданная через create_all (например, в тестах), не
+# обновлялась бы. Изменения пишутся в случайный из 16 шардов.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_status_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), count(*)
+        FROM new_rows
+        GROUP BY status
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), -count(*)
+        FROM old_rows
+        GROUP BY status
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    ELSE
+        INSERT INTO task_status_counts AS c (status, shard, count)
+        SELECT status, floor(random() * 16), sum(delta)
+        FROM (
+            SELECT status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT status, -1 AS delta FROM old_rows
+        ) AS changes
+        GROUP BY status
+        HAVING sum(delta) <> 0
+        ON CONFLICT (status, shard)
+        DO UPDATE SET count = c.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "insert": "REFERENCING NEW TABLE AS new_rows",
+    "update": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "REFERENCING OLD TABLE AS old_rows",
+}
+
+# Триггеры вешаются на tasks, поэтому создаются после всех таблиц.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(APPLY_FUNCTION).execute_if(dialect="postgresql"),
+)
+for _event, _referencing in TRIGGERS.items():
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER tasks_status_counts_{_event} "
+            f"AFTER {_event.upper()} ON tasks {_referencing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_apply()"
+        ).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    Base.metadata,
+    "after_drop",
+    DDL("DROP FUNCTION IF EXISTS task_status_counts_apply()").execute_if(
+        dialect="postgresql"
+    ),
+)
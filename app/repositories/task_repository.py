@@ -1,12 +1,189 @@
 import uuid
+from collections.abc import AsyncIterator, Collection
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Row,
+    Select,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import DEFAULT_PAGE_SIZE
+from app.core.constants import (
+    DEFAULT_PAGE_SIZE,
+    MAX_BULK_ITEMS,
+    SEARCH_LANGUAGE,
+)
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
 from app.models.task import Task
 
+COPY_COLUMNS = ("id", "title", "description", "status")
+
+# Колонки TaskOut: чтения для ответов выбирают только их Core-запросом.
+# description — последней: длинный текст из TOAST читается, только если
+# он нужен клиенту (см. read_columns).
+READ_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.status,
+    Task.version,
+    Task.description,
+)
+
+
+def read_columns(description: bool = True) -> tuple:
+    """READ_COLUMNS с description или без неё."""
+    return READ_COLUMNS if description else READ_COLUMNS[:-1]
+
+
+class TaskRow:
+    """Задача только для чтения: значения READ_COLUMNS без ORM-состояния.
+
+    В отличие от Task не попадает в identity map сессии и не несёт
+    InstanceState. Row для этого не годится: проверка pydantic
+    (from_attributes) на каждой строке упирается в дорогой промах
+    Row.__getattr__, а объект с __slots__ и создаётся, и читается быстро.
+    Если description не выбиралась, она равна None.
+    """
+
+    __slots__ = ("id", "title", "status", "version", "description")
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        title: str,
+        status: TaskStatus,
+        version: int,
+        description: str | None = None,
+    ):
+        self.id = id
+        self.title = title
+        self.status = status
+        self.version = version
+        self.description = description
+
+
+def _uuid_array(ids: List[uuid.UUID]):
+    """Список id одним параметром-массивом для id = ANY(:ids)."""
+    return literal(list(ids), ARRAY(UUID(as_uuid=True)))
+
+
+def sort_key_columns(sort: TaskSortField) -> tuple:
+    """Колонки ключа сортировки; id добавляется для однозначного порядка."""
+    if sort is TaskSortField.ID:
+        return (Task.id,)
+    return (getattr(Task, sort.value), Task.id)
+
+
+def list_query(
+    limit: int,
+    offset: int = 0,
+    after: tuple | None = None,
+    status: TaskStatus | None = None,
+    sort: TaskSortField = TaskSortField.ID,
+    order: SortOrder = SortOrder.ASC,
+    description: bool = True,
+) -> Select:
+    """SELECT страницы списка задач (колонки read_columns).
+
+    Каждое поддерживаемое сочетание фильтра и сортировки читается
+    диапазоном одного из индексов: PK, ix_tasks_title_id,
+    ix_tasks_status_id или ix_tasks_status_title_id. Keyset-условие
+    записано сравнением строк (title, id) > (:title, :id), которое
+    Postgres тоже отдаёт индексу.
+    """
+    keys = sort_key_columns(sort)
+    descending = order is SortOrder.DESC
+    stmt = select(*read_columns(description))
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if after is not None:
+        if len(keys) == 1:
+            row, bound = keys[0], after[0]
+        else:
+            row, bound = tuple_(*keys), tuple(after)
+        stmt = stmt.where(row < bound if descending else row > bound)
+    stmt = stmt.order_by(*(key.desc() if descending else key for key in keys))
+    if offset:
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit)
+
+
+def title_prefix_key():
+    """lower(title) в побайтовом порядке, как в ix_tasks_title_prefix."""
+    return func.lower(Task.title).collate("C")
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Наименьшая строка больше всех строк, начинающихся с prefix.
+
+    В порядке "C" такие строки занимают диапазон [prefix, bound). None —
+    верхней границы нет (prefix состоит из максимальных символов).
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def suggest_query(prefix: str, limit: int) -> Select:
+    """id и title задач, чьё название начинается с prefix (в нижнем регистре).
+
+    Префикс превращён в диапазон по ключу индекса ix_tasks_title_prefix,
+    который покрывает id и title, поэтому запрос читается index-only
+    сканированием без обращения к таблице. LIKE здесь не подходит:
+    в подготовленном запросе шаблон неизвестен планировщику.
+    """
+    key = title_prefix_key()
+    stmt = select(Task.id, Task.title).where(key >= prefix)
+    upper = prefix_upper_bound(prefix)
+    if upper is not None:
+        stmt = stmt.where(key < upper)
+    return stmt.order_by(key, Task.id).limit(limit)
+
+
+def search_query(
+    terms: List[str],
+    limit: int,
+    after: tuple | None = None,
+    fuzzy: bool = False,
+) -> Select:
+    """SELECT колонок задач по словам запроса и их релевантности (rank).
+
+    Обычный режим ищет все слова как префиксы по search_vector через
+    GIN-индекс ix_tasks_search_vector. Нечёткий режим сравнивает запрос
+    с title по триграммам (pg_trgm, индекс ix_tasks_title_trgm) и
+    находит слова с опечатками. Порядок — по убыванию релевантности,
+    затем id; after — (rank, id) последней строки предыдущей страницы.
+    """
+    if fuzzy:
+        phrase = " ".join(terms)
+        condition = Task.title.op("%>")(phrase)
+        rank = func.word_similarity(phrase, Task.title)
+    else:
+        query = func.to_tsquery(
+            SEARCH_LANGUAGE, " & ".join(f"{term}:*" for term in terms)
+        )
+        condition = Task.search_vector.op("@@")(query)
+        rank = func.ts_rank(Task.search_vector, query)
+    rank = rank.label("rank")
+    stmt = select(*READ_COLUMNS, rank).where(condition)
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Task.id) < tuple(after))
+    return stmt.order_by(rank.desc(), Task.id.desc()).limit(limit)
+
 
 class TaskRepository:
     """Асинхронный репозиторий для операций с задачами."""
@@ -14,28 +191,228 @@ class TaskRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, obj: Task) -> Task:
-        self.db.add(obj)
-        await self.db.flush()
-        await self.db.refresh(obj)
-        return obj
+    async def create(self, values: dict) -> Task:
+        """Вставить задачу одним INSERT ... RETURNING."""
+        stmt = insert(Task).values(**values).returning(Task)
+        return await self.db.scalar(stmt)
+
+    async def create_many(self, rows: List[dict]) -> List[Task]:
+        """Вставить пачку задач одним INSERT ... VALUES ... RETURNING.
+
+        Строки результата идут в порядке входных параметров.
+        """
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        result = await self.db.scalars(stmt, rows)
+        return result.all()
+
+    async def copy_rows(self, records: List[tuple]) -> None:
+        """Загрузить строки протоколом COPY в текущей транзакции.
+
+        records — кортежи в порядке COPY_COLUMNS; статус передаётся
+        именем значения перечисления task_status.
+        """
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Task.__tablename__, records=records, columns=COPY_COLUMNS
+        )
 
     async def get(self, task_id: uuid.UUID) -> Task | None:
         return await self.db.get(Task, task_id)
 
+    async def get_version(self, task_id: uuid.UUID) -> int | None:
+        """Только версия задачи, без чтения остальных колонок."""
+        stmt = select(Task.version).where(Task.id == task_id)
+        return await self.db.scalar(stmt)
+
+    async def get_row(
+        self, task_id: uuid.UUID, description: bool = True
+    ) -> TaskRow | None:
+        """Задача по id Core-запросом, при description=False без неё."""
+        stmt = select(*read_columns(description)).where(Task.id == task_id)
+        row = (await self.db.execute(stmt)).first()
+        return TaskRow(*row) if row is not None else None
+
+    async def get_many(
+        self, ids: List[uuid.UUID], description: bool = True
+    ) -> List[TaskRow]:
+        """Задачи по списку id одним SELECT ... WHERE id = ANY(:ids).
+
+        Порядок строк не определён; отсутствующих id в результате нет.
+        """
+        stmt = select(*read_columns(description)).where(
+            Task.id == any_(_uuid_array(ids))
+        )
+        result = await self.db.execute(stmt)
+        return [TaskRow(*row) for row in result]
+
     async def list(
-        self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE
-    ) -> List[Task]:
-        stmt = select(Task).offset(offset).limit(limit)
+        self,
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: tuple | None = None,
+        status: TaskStatus | None = None,
+        sort: TaskSortField = TaskSortField.ID,
+        order: SortOrder = SortOrder.ASC,
+        description: bool = True,
+    ) -> List[TaskRow]:
+        """Страница задач (TaskRow) с фильтром по статусу и сортировкой.
+
+        after — значения ключа сортировки последней строки предыдущей
+        страницы (keyset-режим), см. list_query.
+        """
+        stmt = list_query(
+            limit,
+            offset=offset,
+            after=after,
+            status=status,
+            sort=sort,
+            order=order,
+            description=description,
+        )
         result = await self.db.execute(stmt)
-        return result.scalars().all()
+        return [TaskRow(*row) for row in result]
+
+    async def search(
+        self,
+        terms: List[str],
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: tuple | None = None,
+        fuzzy: bool = False,
+    ) -> List[tuple[TaskRow, float]]:
+        """Найденные задачи парами (TaskRow, rank), см. search_query."""
+        stmt = search_query(terms, limit, after=after, fuzzy=fuzzy)
+        result = await self.db.execute(stmt)
+        return [(TaskRow(*row[:-1]), row.rank) for row in result]
+
+    async def suggest(self, prefix: str, limit: int) -> List[Row]:
+        """Строки (id, title) для подсказок, см. suggest_query."""
+        result = await self.db.execute(suggest_query(prefix, limit))
+        return result.all()
+
+    async def stream(
+        self,
+        batch_size: int,
+        status: TaskStatus | None = None,
+        description: bool = True,
+    ) -> AsyncIterator[List[TaskRow]]:
+        """Задачи пачками TaskRow через серверный курсор.
+
+        Строки читаются по мере отправки, поэтому память не зависит от
+        размера таблицы; ORM-объекты не создаются, и сессия между пачками
+        ничего не накапливает.
+        """
+        stmt = (
+            select(*read_columns(description))
+            .order_by(Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if status is not None:
+            stmt = stmt.where(Task.status == status)
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield [TaskRow(*row) for row in partition]
+
+    async def update(
+        self,
+        task_id: uuid.UUID,
+        values: dict,
+        expected_versions: Collection[int] | None = None,
+    ) -> Task | None:
+        """Обновить переданные поля одним UPDATE ... RETURNING.
+
+        С expected_versions строка обновляется, только если её версия
+        есть в списке. None означает, что подходящей строки нет.
+        """
+        stmt = (
+            update(Task)
+            .where(Task.id == task_id)
+            .values(**values, version=Task.version + 1)
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_versions is not None:
+            stmt = stmt.where(Task.version.in_(expected_versions))
+        return await self.db.scalar(stmt)
+
+    async def set_status(
+        self,
+        status: TaskStatus,
+        ids: List[uuid.UUID] | None = None,
+        expected_status: TaskStatus | None = None,
+        limit: int = MAX_BULK_ITEMS,
+    ) -> List[Task]:
+        """Перевести задачи в статус одним UPDATE ... RETURNING.
+
+        Условие на expected_status проверяется в том же UPDATE, поэтому
+        конкурирующие воркеры не могут перевести одну задачу дважды.
+        Без ids переводится не больше limit задач: их id выбираются
+        подзапросом, как в claim, а не всей таблицей одним UPDATE.
+        """
+        stmt = (
+            update(Task)
+            .values(status=status, version=Task.version + 1)
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        if ids is not None:
+            stmt = stmt.where(Task.id == any_(_uuid_array(ids)))
+        else:
+            candidates = select(Task.id)
+            if expected_status is not None:
+                candidates = candidates.where(Task.status == expected_status)
+            candidates = (
+                candidates.order_by(Task.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = stmt.where(Task.id.in_(candidates))
+        if expected_status is not None:
+            stmt = stmt.where(Task.status == expected_status)
+        result = await self.db.scalars(stmt)
+        return result.all()
+
+    async def claim(self, limit: int) -> List[Task]:
+        """Забрать до limit созданных задач в работу.
+
+        Строки выбираются по индексу ix_tasks_status_id (status, id) с
+        FOR UPDATE SKIP LOCKED: строки, уже заблокированные другими
+        воркерами, пропускаются без ожидания.
+        """
+        claimable = (
+            select(Task.id)
+            .where(Task.status == TaskStatus.CREATED)
+            .order_by(Task.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Task)
+            .where(Task.id.in_(claimable))
+            .values(status=TaskStatus.IN_PROGRESS, version=Task.version + 1)
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.scalars(stmt)
+        return result.all()
 
-    async def update(self, obj: Task) -> Task:
-        self.db.add(obj)
-        await self.db.flush()
-        await self.db.refresh(obj)
-        return obj
+    async def delete(self, task_id: uuid.UUID) -> bool:
+        """Удалить задачу одним DELETE ... RETURNING id."""
+        stmt = (
+            delete(Task)
+            .where(Task.id == task_id)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return await self.db.scalar(stmt) is not None
 
-    async def delete(self, obj: Task) -> None:
-        await self.db.delete(obj)
-        await self.db.flush()
+    async def delete_many(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        """Удалить задачи по списку id, вернуть id удалённых."""
+        stmt = (
+            delete(Task)
+            .where(Task.id == any_(_uuid_array(ids)))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.scalars(stmt)
+        return result.all()
@@ -0,0 +1,87 @@
+import json
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.enums import TaskStatus
+from app.models.task import Task
+from app.models.task_status_count import TaskStatusCount
+
+CORRECTION_SHARD = 0
+
+RELTUPLES = text(
+    "SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+class TaskStatsRepository:
+    """Счётчики задач по статусам.
+
+    Таблицу task_status_counts ведут триггеры на tasks (см. миграцию
+    task_status_counts), поэтому счётчики меняются в той же транзакции,
+    что и задачи, включая массовые операции и COPY.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def counts(self) -> dict[TaskStatus, int]:
+        """Число задач по статусам из счётчиков, без чтения tasks."""
+        stmt = select(
+            TaskStatusCount.status, func.sum(TaskStatusCount.count)
+        ).group_by(TaskStatusCount.status)
+        result = await self.db.execute(stmt)
+        return {status: int(count) for status, count in result.all()}
+
+    async def actual_counts(self) -> dict[TaskStatus, int]:
+        """Точное число задач по статусам полным проходом по tasks."""
+        stmt = select(Task.status, func.count()).group_by(Task.status)
+        result = await self.db.execute(stmt)
+        return dict(result.all())
+
+    async def count(self, status: TaskStatus | None = None) -> int:
+        """Число задач в статусе (или всех) по счётчикам."""
+        stmt = select(func.coalesce(func.sum(TaskStatusCount.count), 0))
+        if status is not None:
+            stmt = stmt.where(TaskStatusCount.status == status)
+        return int(await self.db.scalar(stmt))
+
+    async def estimate(self, status: TaskStatus | None = None) -> int:
+        """Оценка числа задач по статистике планировщика.
+
+        Без фильтра берётся pg_class.reltuples; с фильтром (или если
+        таблицу ещё не анализировали) — оценка строк из EXPLAIN.
+        """
+        if status is None:
+            reltuples = await self.db.scalar(
+                RELTUPLES, {"table": Task.__tablename__}
+            )
+            if reltuples is not None and reltuples >= 0:
+                return int(reltuples)
+        stmt = select(Task.id)
+        if status is not None:
+            stmt = stmt.where(Task.status == status)
+        sql = stmt.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = await self.db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def add(self, deltas: dict[TaskStatus, int]) -> None:
+        """Прибавить поправки к счётчикам одним INSERT ... ON CONFLICT."""
+        stmt = insert(TaskStatusCount).values(
+            [
+                {"status": status, "shard": CORRECTION_SHARD, "count": delta}
+                for status, delta in deltas.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskStatusCount.status, TaskStatusCount.shard],
+            set_={"count": TaskStatusCount.count + stmt.excluded.count},
+        )
+        await self.db.execute(stmt)
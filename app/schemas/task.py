@@ -1,8 +1,14 @@
 import uuid
+from typing import Any
 
-from pydantic import BaseModel, Field, constr
+from pydantic import BaseModel, Field, TypeAdapter, constr, model_validator
 
-from app.core.constants import TITLE_MAX_LENGTH, TITLE_MIN_LENGTH
+from app.core.constants import (
+    MAX_BATCH_GET_ITEMS,
+    MAX_BULK_ITEMS,
+    TITLE_MAX_LENGTH,
+    TITLE_MIN_LENGTH,
+)
 from app.db.enums import TaskStatus
 
 TitleStr = constr(min_length=TITLE_MIN_LENGTH, max_length=TITLE_MAX_LENGTH)
@@ -26,5 +32,122 @@ class TaskUpdate(BaseModel):
 class TaskOut(TaskBase):
     id: uuid.UUID
     status: TaskStatus
+    version: int | None = Field(
+        None, description="Версия задачи, растёт при каждом изменении"
+    )
 
     model_config = {"from_attributes": True}
+
+
+# Пачка строк БД проверяется одним вызовом вместо model_validate на каждую.
+TaskOutList = TypeAdapter(list[TaskOut])
+
+
+class TaskSuggestion(BaseModel):
+    id: uuid.UUID
+    title: str
+
+    model_config = {"from_attributes": True}
+
+
+class TaskBulkItemResult(BaseModel):
+    index: int = Field(..., description="Позиция элемента во входном списке")
+    ok: bool
+    task: TaskOut | None = None
+    errors: list[dict[str, Any]] | None = None
+
+
+class TaskBulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    items: list[TaskBulkItemResult]
+
+
+class TaskBulkDelete(BaseModel):
+    ids: list[uuid.UUID] = Field(
+        ..., min_length=1, max_length=MAX_BULK_ITEMS, description="id задач"
+    )
+
+
+class TaskBulkDeleteResult(BaseModel):
+    deleted: list[uuid.UUID]
+    not_found: list[uuid.UUID]
+
+
+class TaskBatchGet(BaseModel):
+    ids: list[uuid.UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_GET_ITEMS,
+        description="id задач",
+    )
+
+
+class TaskBatchGetResult(BaseModel):
+    items: list[TaskOut] = Field(
+        ..., description="Найденные задачи в порядке запроса"
+    )
+    not_found: list[uuid.UUID]
+
+
+class TaskTransition(BaseModel):
+    ids: list[uuid.UUID] | None = Field(
+        None,
+        min_length=1,
+        max_length=MAX_BULK_ITEMS,
+        description="id задач; без них переводятся все задачи "
+        "в статусе expected_status",
+    )
+    status: TaskStatus = Field(..., description="Целевой статус")
+    expected_status: TaskStatus | None = Field(
+        None, description="Менять только задачи в этом статусе"
+    )
+    limit: int = Field(
+        MAX_BULK_ITEMS,
+        ge=1,
+        le=MAX_BULK_ITEMS,
+        description="Сколько задач перевести за запрос, если ids не указаны",
+    )
+
+    @model_validator(mode="after")
+    def check_target(self) -> "TaskTransition":
+        if self.ids is None and self.expected_status is None:
+            raise ValueError("Нужно указать ids или expected_status")
+        return self
+
+
+class TaskTransitionResult(BaseModel):
+    updated: list[TaskOut]
+    skipped: list[uuid.UUID] = Field(
+        default_factory=list,
+        description="id, которые не найдены или были в другом статусе",
+    )
+
+
+class TaskImportRowError(BaseModel):
+    line: int = Field(..., description="Номер строки во входном файле")
+    errors: list[dict[str, Any]]
+
+
+class TaskImportBatch(BaseModel):
+    index: int
+    rows: int = 0
+    inserted: int = 0
+    errors: list[TaskImportRowError] = Field(default_factory=list)
+    error: str | None = Field(None, description="Ошибка записи пачки в БД")
+
+
+class TaskImportReport(BaseModel):
+    rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    rows_per_second: float = 0.0
+    batches: list[TaskImportBatch] = Field(default_factory=list)
+
+
+class TaskStats(BaseModel):
+    total: int = 0
+    by_status: dict[TaskStatus, int] = Field(
+        default_factory=dict, description="Число задач в каждом статусе"
+    )
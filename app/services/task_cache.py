@@ -0,0 +1,56 @@
+import uuid
+
+from app.core.config import settings
+from app.db.enums import TaskStatus
+from app.utils.cache import CacheBackend, LRUCache
+
+_backend: CacheBackend | None = (
+    LRUCache("task", settings.task_cache_size, settings.task_cache_ttl)
+    if settings.task_cache_size
+    else None
+)
+
+_suggest_backend: CacheBackend | None = (
+    LRUCache(
+        "task_suggest", settings.suggest_cache_size, settings.suggest_cache_ttl
+    )
+    if settings.suggest_cache_size
+    else None
+)
+
+_total_backend: CacheBackend = LRUCache(
+    "task_total", len(TaskStatus) + 1, settings.total_cache_ttl
+)
+
+
+def get_task_cache() -> CacheBackend | None:
+    """Текущий бэкенд кэша задач (None, если кэш выключен)."""
+    return _backend
+
+
+def set_task_cache(backend: CacheBackend | None) -> None:
+    """Подменить бэкенд кэша задач, например, на общий для всех воркеров."""
+    global _backend
+    _backend = backend
+
+
+def task_cache_key(task_id: uuid.UUID) -> str:
+    return f"task:{task_id}"
+
+
+def get_suggest_cache() -> CacheBackend | None:
+    """Кэш подсказок по коротким префиксам названий (None — выключен)."""
+    return _suggest_backend
+
+
+def suggest_cache_key(prefix: str) -> str:
+    return f"suggest:{prefix}"
+
+
+def get_total_cache() -> CacheBackend:
+    """Кэш точного числа задач по фильтру списка."""
+    return _total_backend
+
+
+def total_cache_key(status: TaskStatus | None) -> str:
+    return f"total:{status.name if status else '*'}"
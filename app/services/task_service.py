@@ -1,62 +1,611 @@
+import logging
+import re
+import time
 import uuid
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Collection,
+)
+from typing import List
 
+import asyncpg
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import DEFAULT_PAGE_SIZE
-from app.db.enums import TaskStatus
+from app.core.config import settings
+from app.core.constants import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SUGGEST_LIMIT,
+    MAX_BULK_ITEMS,
+    MAX_IMPORT_ERRORS_PER_BATCH,
+    MAX_SUGGEST_LIMIT,
+    SUGGEST_CACHE_PREFIX_LENGTH,
+)
+from app.db.db import AsyncSessionLocal
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
+from app.db.replicas import ReplicaSession
 from app.models.task import Task
-from app.repositories.task_repository import TaskRepository
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.repositories.task_repository import (
+    TaskRepository,
+    TaskRow,
+    sort_key_columns,
+)
+from app.schemas.task import (
+    TaskCreate,
+    TaskImportBatch,
+    TaskImportReport,
+    TaskImportRowError,
+    TaskOut,
+    TaskSuggestion,
+    TaskUpdate,
+)
+from app.services.task_cache import (
+    get_suggest_cache,
+    get_task_cache,
+    suggest_cache_key,
+    task_cache_key,
+)
+from app.utils.cache import CacheBackend
+from app.utils.export import (
+    EXPORT_FIELDS,
+    DataFormat,
+    csv_header,
+    encode_chunk,
+)
+from app.utils.group_commit import GroupCommitter
+from app.utils.importing import ImportRecord, batched
+from app.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_get_flight = SingleFlight("task_get")
+_list_flight = SingleFlight("task_list")
+
+_SEARCH_TERM = re.compile(r"[^\W_]+")
+
+_suggestions = TypeAdapter(List[TaskSuggestion])
+
+
+def _new_task_values(data: TaskCreate) -> dict:
+    return {
+        "title": data.title,
+        "description": data.description,
+        "status": TaskStatus.CREATED,
+    }
+
+
+async def _insert_tasks(rows: List[dict]) -> List[Task]:
+    """Пачка group commit: один INSERT и один COMMIT в своей сессии."""
+    async with AsyncSessionLocal() as db:
+        tasks = await TaskRepository(db).create_many(rows)
+        await db.commit()
+    return tasks
+
+
+_create_commits = (
+    GroupCommitter(
+        "task_create",
+        _insert_tasks,
+        max_batch=settings.group_commit_max_batch,
+        max_delay=settings.group_commit_max_delay,
+    )
+    if settings.group_commit_max_batch
+    else None
+)
+
+
+async def flush_pending_creates() -> None:
+    """Дописать создания, ждущие group commit (при остановке приложения)."""
+    if _create_commits is not None:
+        await _create_commits.close()
+
+
+def _encode_position(task, sort: TaskSortField, order: SortOrder) -> str:
+    key = []
+    for column in sort_key_columns(sort):
+        value = getattr(task, column.key)
+        key.append(value.name if isinstance(value, TaskStatus) else str(value))
+    return encode_cursor({"s": sort.value, "o": order.value, "k": key})
+
+
+def _decode_position(
+    cursor: str, sort: TaskSortField, order: SortOrder
+) -> tuple:
+    """Ключ сортировки из курсора; курсор другой сортировки отвергается."""
+    payload = decode_cursor(cursor)
+    columns = sort_key_columns(sort)
+    key = payload.get("k")
+    if (
+        payload.get("s") != sort.value
+        or payload.get("o") != order.value
+        or not isinstance(key, list)
+        or len(key) != len(columns)
+        or not all(isinstance(value, str) for value in key)
+    ):
+        raise InvalidCursorError(cursor)
+    try:
+        return tuple(
+            _parse_key(column.key, value)
+            for column, value in zip(columns, key, strict=True)
+        )
+    except (KeyError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def _parse_key(field: str, value: str):
+    if field == "id":
+        return uuid.UUID(value)
+    if field == "status":
+        return TaskStatus[value]
+    return str(value)
+
+
+def _decode_search_position(cursor: str, q: str) -> tuple[bool, tuple]:
+    """Режим поиска и (rank, id) из курсора, выданного для того же q."""
+    payload = decode_cursor(cursor)
+    key = payload.get("k")
+    if (
+        payload.get("q") != q
+        or payload.get("m") not in ("fts", "trgm")
+        or not isinstance(key, list)
+        or len(key) != 2
+        or not isinstance(key[0], (int, float))
+        or not isinstance(key[1], str)
+    ):
+        raise InvalidCursorError(cursor)
+    try:
+        after = (float(key[0]), uuid.UUID(key[1]))
+    except ValueError as e:
+        raise InvalidCursorError(cursor) from e
+    return payload["m"] == "trgm", after
+
+
+class VersionConflictError(Exception):
+    """Версия задачи не совпала с ожидаемой (If-Match)."""
 
 
 class TaskService:
     """Асинхронный сервис-обёртка над репозиторием с бизнес-правилами."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: CacheBackend | None = None):
         self.repo = TaskRepository(db)
         self.db = db
+        self.cache = cache if cache is not None else get_task_cache()
+        # Данные с реплики могут быть старше последней инвалидации, поэтому
+        # в кэш они не пишутся, а одновременные чтения с реплики и из
+        # основной БД не объединяются.
+        self.from_replica = isinstance(db, ReplicaSession)
+
+    async def _invalidate(self, ids) -> None:
+        if self.cache is not None and ids:
+            await self.cache.delete(*(task_cache_key(i) for i in ids))
 
     async def create(self, data: TaskCreate) -> Task:
-        task = Task(
-            title=data.title,
-            description=data.description,
-            status=TaskStatus.CREATED,
-        )
-        task = await self.repo.create(task)
+        """Создать задачу.
+
+        С GROUP_COMMIT_MAX_BATCH одновременные создания объединяются в
+        один INSERT и один COMMIT; запрос ждёт свою пачку не дольше
+        GROUP_COMMIT_MAX_DELAY секунд.
+        """
+        values = _new_task_values(data)
+        if _create_commits is not None:
+            return await _create_commits.submit(values)
+        task = await self.repo.create(values)
         await self.db.commit()
-        await self.db.refresh(task)
         return task
 
-    async def get(self, task_id: uuid.UUID) -> Task | None:
-        return await self.repo.get(task_id)
+    async def create_many(
+        self, items: List[TaskCreate], batch_size: int | None = None
+    ) -> List[Task]:
+        """Создать задачи пачками в одной транзакции."""
+        batch_size = batch_size or settings.bulk_batch_size
+        rows = [_new_task_values(data) for data in items]
+        tasks = []
+        for start in range(0, len(rows), batch_size):
+            tasks.extend(
+                await self.repo.create_many(rows[start : start + batch_size])
+            )
+        await self.db.commit()
+        return tasks
+
+    async def import_tasks(
+        self,
+        records: AsyncIterable[ImportRecord],
+        batch_size: int | None = None,
+        on_batch: (
+            Callable[[TaskImportBatch, TaskImportReport], None] | None
+        ) = None,
+    ) -> TaskImportReport:
+        """Массовая загрузка задач через COPY.
+
+        Каждая пачка валидируется по TaskCreate и записывается в своей
+        транзакции: ошибка одной пачки не откатывает уже загруженные.
+        """
+        batch_size = batch_size or settings.import_batch_size
+        report = TaskImportReport()
+        started = time.perf_counter()
+        async for records_batch in batched(records, batch_size):
+            batch = await self._import_batch(
+                len(report.batches), records_batch
+            )
+            report.batches.append(batch)
+            report.rows += batch.rows
+            report.inserted += batch.inserted
+            report.failed += batch.rows - batch.inserted
+            report.elapsed = time.perf_counter() - started
+            report.rows_per_second = report.rows / (report.elapsed or 1e-9)
+            logger.info(
+                "Импорт: пачка %s, загружено %s из %s строк, %.0f строк/с",
+                batch.index,
+                report.inserted,
+                report.rows,
+                report.rows_per_second,
+            )
+            if on_batch is not None:
+                on_batch(batch, report)
+        return report
+
+    async def _import_batch(
+        self, index: int, records: List[ImportRecord]
+    ) -> TaskImportBatch:
+        batch = TaskImportBatch(index=index, rows=len(records))
+        rows = []
+        invalid = 0
+        for line, record in records:
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                data = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                errors = e.errors(
+                    include_url=False,
+                    include_context=False,
+                    include_input=False,
+                )
+            except ValueError as e:
+                errors = [{"msg": str(e), "type": "value_error"}]
+            else:
+                rows.append(
+                    (
+                        uuid.uuid4(),
+                        data.title,
+                        data.description,
+                        TaskStatus.CREATED.name,
+                    )
+                )
+                continue
+            invalid += 1
+            if invalid <= MAX_IMPORT_ERRORS_PER_BATCH:
+                batch.errors.append(
+                    TaskImportRowError(line=line, errors=errors)
+                )
+        if not rows:
+            return batch
+        try:
+            await self.repo.copy_rows(rows)
+            await self.db.commit()
+        except (asyncpg.PostgresError, SQLAlchemyError) as e:
+            await self.db.rollback()
+            batch.error = str(e)
+            logger.warning("Импорт: пачка %s не записана: %s", index, e)
+            return batch
+        batch.inserted = len(rows)
+        return batch
+
+    async def get(
+        self, task_id: uuid.UUID, description: bool = True
+    ) -> Task | TaskRow | TaskOut | None:
+        """Задача по id через read-through кэш сериализованных TaskOut.
+
+        Одновременные промахи по одному id выполняют один SELECT. С
+        description=False при промахе описание не читается, а неполная
+        задача не попадает в кэш.
+        """
+        flight_key = (task_id, self.from_replica, description)
+        if self.cache is not None:
+            payload = await self.cache.get(task_cache_key(task_id))
+            if payload is not None:
+                return TaskOut.model_validate_json(payload)
+        if not description:
+            return await _get_flight.do(
+                flight_key,
+                lambda: self.repo.get_row(task_id, description=False),
+            )
+        if self.cache is None or self.from_replica:
+            return await _get_flight.do(
+                flight_key, lambda: self.repo.get(task_id)
+            )
+        return await _get_flight.do(flight_key, lambda: self._load(task_id))
+
+    async def get_version(self, task_id: uuid.UUID) -> int | None:
+        """Версия задачи для условных запросов: из кэша или по id."""
+        if self.cache is not None:
+            payload = await self.cache.get(task_cache_key(task_id))
+            if payload is not None:
+                version = TaskOut.model_validate_json(payload).version
+                if version is not None:
+                    return version
+        return await self.repo.get_version(task_id)
+
+    async def get_many(
+        self, ids: List[uuid.UUID], description: bool = True
+    ) -> dict[uuid.UUID, TaskRow | TaskOut]:
+        """Найденные задачи по id: из кэша, остальные одним запросом.
+
+        Полные задачи, прочитанные из основной БД, кладутся в кэш, как в
+        get; отсутствующих id в результате нет.
+        """
+        found: dict[uuid.UUID, TaskRow | TaskOut] = {}
+        missing = ids
+        if self.cache is not None:
+            missing = []
+            for task_id in ids:
+                payload = await self.cache.get(task_cache_key(task_id))
+                if payload is None:
+                    missing.append(task_id)
+                else:
+                    found[task_id] = TaskOut.model_validate_json(payload)
+        if not missing:
+            return found
+        fill = self.cache is not None and description and not self.from_replica
+        if fill:
+            generation = await self.cache.generation()
+        rows = await self.repo.get_many(missing, description=description)
+        for row in rows:
+            if fill:
+                out = TaskOut.model_validate(row)
+                await self.cache.set(
+                    task_cache_key(row.id),
+                    out.model_dump_json().encode(),
+                    since=generation,
+                )
+                found[row.id] = out
+            else:
+                found[row.id] = row
+        return found
+
+    async def _load(self, task_id: uuid.UUID) -> Task | None:
+        # Если задачу изменят, пока идёт чтение, прочитанная копия уже
+        # устарела: since не даст вернуть её в кэш после инвалидации.
+        generation = await self.cache.generation()
+        task = await self.repo.get(task_id)
+        if task is not None:
+            out = TaskOut.model_validate(task)
+            await self.cache.set(
+                task_cache_key(task_id),
+                out.model_dump_json().encode(),
+                since=generation,
+            )
+        return task
 
     async def list(
-        self, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE
-    ) -> list[Task]:
+        self,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        status: TaskStatus | None = None,
+        sort: TaskSortField = TaskSortField.ID,
+        order: SortOrder = SortOrder.ASC,
+        description: bool = True,
+    ) -> List[TaskRow]:
         offset = max(page - 1, 0) * page_size
-        return await self.repo.list(offset=offset, limit=page_size)
+        return await _list_flight.do(
+            (
+                "offset",
+                offset,
+                page_size,
+                status,
+                sort,
+                order,
+                description,
+                self.from_replica,
+            ),
+            lambda: self.repo.list(
+                offset=offset,
+                limit=page_size,
+                status=status,
+                sort=sort,
+                order=order,
+                description=description,
+            ),
+        )
+
+    async def list_after(
+        self,
+        cursor: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        status: TaskStatus | None = None,
+        sort: TaskSortField = TaskSortField.ID,
+        order: SortOrder = SortOrder.ASC,
+        description: bool = True,
+    ) -> tuple[List[TaskRow], str | None]:
+        """Keyset-страница задач и курсор следующей страницы.
+
+        Запрашивается page_size + 1 строк: лишняя строка лишь сообщает
+        о наличии продолжения и заменяет COUNT. description=False — не
+        читать описания задач.
+        """
+        after = _decode_position(cursor, sort, order) if cursor else None
+        tasks = await _list_flight.do(
+            (
+                "after",
+                after,
+                page_size,
+                status,
+                sort,
+                order,
+                description,
+                self.from_replica,
+            ),
+            lambda: self.repo.list(
+                limit=page_size + 1,
+                after=after,
+                status=status,
+                sort=sort,
+                order=order,
+                description=description,
+            ),
+        )
+        if len(tasks) <= page_size:
+            return tasks, None
+        tasks = tasks[:page_size]
+        return tasks, _encode_position(tasks[-1], sort, order)
+
+    async def search(
+        self,
+        q: str,
+        cursor: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[List[TaskRow], str | None]:
+        """Поиск задач по словам из title и description.
+
+        Сначала ищутся слова как префиксы по полнотекстовому индексу;
+        если ничего не найдено, первая страница повторяется нечётким
+        поиском по title, чтобы находить запросы с опечатками. Режим
+        сохраняется в курсоре, и следующие страницы идут тем же путём.
+        """
+        terms = [term.lower() for term in _SEARCH_TERM.findall(q)]
+        if not terms:
+            return [], None
+        if cursor:
+            fuzzy, after = _decode_search_position(cursor, q)
+            rows = await self.repo.search(
+                terms, limit=page_size + 1, after=after, fuzzy=fuzzy
+            )
+        else:
+            fuzzy = False
+            rows = await self.repo.search(terms, limit=page_size + 1)
+            if not rows:
+                fuzzy = True
+                rows = await self.repo.search(
+                    terms, limit=page_size + 1, fuzzy=True
+                )
+        tasks = [row[0] for row in rows[:page_size]]
+        if len(rows) <= page_size:
+            return tasks, None
+        task, rank = rows[page_size - 1]
+        next_cursor = encode_cursor(
+            {
+                "q": q,
+                "m": "trgm" if fuzzy else "fts",
+                "k": [rank, str(task.id)],
+            }
+        )
+        return tasks, next_cursor
+
+    async def suggest(
+        self, prefix: str, limit: int = DEFAULT_SUGGEST_LIMIT
+    ) -> List[TaskSuggestion]:
+        """Подсказки: задачи, название которых начинается с prefix.
+
+        Регистр не учитывается. Для коротких префиксов, которые при
+        наборе запрашиваются чаще всего, ненадолго кэшируется первая
+        страница из MAX_SUGGEST_LIMIT строк, и любой limit отдаётся из неё.
+        """
+        prefix = prefix.lower()
+        cache = get_suggest_cache()
+        if cache is None or len(prefix) > SUGGEST_CACHE_PREFIX_LENGTH:
+            rows = await self.repo.suggest(prefix, limit)
+            return [TaskSuggestion.model_validate(row) for row in rows]
+        key = suggest_cache_key(prefix)
+        payload = await cache.get(key)
+        if payload is not None:
+            return _suggestions.validate_json(payload)[:limit]
+        rows = await self.repo.suggest(prefix, MAX_SUGGEST_LIMIT)
+        suggestions = [TaskSuggestion.model_validate(row) for row in rows]
+        await cache.set(key, _suggestions.dump_json(suggestions))
+        return suggestions[:limit]
+
+    async def export(
+        self,
+        fmt: DataFormat,
+        status: TaskStatus | None = None,
+        chunk_rows: int | None = None,
+        fields: tuple[str, ...] = EXPORT_FIELDS,
+    ) -> AsyncIterator[bytes]:
+        """Выгрузка задач кусками NDJSON или CSV только с полями fields."""
+        if fmt is DataFormat.CSV:
+            yield csv_header(fields)
+        batches = self.repo.stream(
+            chunk_rows or settings.export_chunk_rows,
+            status=status,
+            description="description" in fields,
+        )
+        async for rows in batches:
+            yield encode_chunk(fmt, rows, fields)
 
     async def update(
-        self, task_id: uuid.UUID, data: TaskUpdate
-    ) -> Task | None:
-        task = await self.repo.get(task_id)
+        self,
+        task_id: uuid.UUID,
+        data: TaskUpdate,
+        expected_versions: Collection[int] | None = None,
+    ) -> Task | TaskOut | None:
+        """Частичное обновление с оптимистичной блокировкой по версии.
+
+        Вызывает VersionConflictError, если задача есть, но её версии
+        нет среди expected_versions.
+        """
+        values = data.model_dump(exclude_none=True)
+        if not values:
+            task = await self.get(task_id)
+            if (
+                task is not None
+                and expected_versions is not None
+                and task.version not in expected_versions
+            ):
+                raise VersionConflictError(task_id)
+            return task
+        task = await self.repo.update(
+            task_id, values, expected_versions=expected_versions
+        )
         if not task:
+            if (
+                expected_versions is not None
+                and await self.repo.get_version(task_id) is not None
+            ):
+                raise VersionConflictError(task_id)
             return None
-        if data.title is not None:
-            task.title = data.title
-        if data.description is not None:
-            task.description = data.description
-        if data.status is not None:
-            task.status = data.status
-        task = await self.repo.update(task)
         await self.db.commit()
-        await self.db.refresh(task)
+        await self._invalidate([task_id])
         return task
 
+    async def transition(
+        self,
+        status: TaskStatus,
+        ids: List[uuid.UUID] | None = None,
+        expected_status: TaskStatus | None = None,
+        limit: int = MAX_BULK_ITEMS,
+    ) -> List[Task]:
+        tasks = await self.repo.set_status(
+            status, ids=ids, expected_status=expected_status, limit=limit
+        )
+        await self.db.commit()
+        await self._invalidate([t.id for t in tasks])
+        return tasks
+
+    async def claim(self, limit: int) -> List[Task]:
+        tasks = await self.repo.claim(limit)
+        await self.db.commit()
+        await self._invalidate([t.id for t in tasks])
+        return tasks
+
     async def delete(self, task_id: uuid.UUID) -> bool:
-        task = await self.repo.get(task_id)
-        if not task:
+        deleted = await self.repo.delete(task_id)
+        if not deleted:
             return False
-        await self.repo.delete(task)
         await self.db.commit()
+        await self._invalidate([task_id])
         return True
+
+    async def delete_many(self, ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        deleted = await self.repo.delete_many(ids)
+        await self.db.commit()
+        await self._invalidate(deleted)
+        return deleted
@@ -0,0 +1,70 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.enums import TaskStatus, TotalMode
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.schemas.task import TaskStats
+from app.services.task_cache import get_total_cache, total_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStatsService:
+    """Статистика задач по статусам и сверка счётчиков с таблицей."""
+
+    def __init__(self, db: AsyncSession):
+        self.repo = TaskStatsRepository(db)
+        self.db = db
+
+    async def get(self) -> TaskStats:
+        counts = await self.repo.counts()
+        by_status = {status: counts.get(status, 0) for status in TaskStatus}
+        return TaskStats(total=sum(by_status.values()), by_status=by_status)
+
+    async def total(
+        self, status: TaskStatus | None, mode: TotalMode
+    ) -> int | None:
+        """Число задач для списка с фильтром status.
+
+        exact — по счётчикам статусов, с кэшем на TOTAL_CACHE_TTL секунд
+        на каждый фильтр; estimate — по статистике планировщика; ни один
+        режим не считает строки tasks.
+        """
+        if mode is TotalMode.ESTIMATE:
+            return await self.repo.estimate(status)
+        if mode is not TotalMode.EXACT:
+            return None
+        cache = get_total_cache()
+        key = total_cache_key(status)
+        total = await cache.get(key)
+        if total is None:
+            total = await self.repo.count(status)
+            await cache.set(key, total)
+        return total
+
+    async def reconcile(self) -> dict[TaskStatus, int]:
+        """Исправить расхождение счётчиков с tasks и вернуть поправки.
+
+        Счётчики и реальные числа читаются в одном снимке REPEATABLE READ,
+        поэтому разница между ними не зависит от параллельных записей.
+        Поправка прибавляется отдельной транзакцией: сложение
+        коммутирует с приращениями триггеров, и изменения после снимка
+        не теряются и не учитываются дважды.
+        """
+        await self.db.connection(
+            execution_options={"isolation_level": "REPEATABLE READ"}
+        )
+        counts = await self.repo.counts()
+        actual = await self.repo.actual_counts()
+        await self.db.commit()
+        drift = {
+            status: actual.get(status, 0) - counts.get(status, 0)
+            for status in TaskStatus
+        }
+        drift = {status: delta for status, delta in drift.items() if delta}
+        if drift:
+            await self.repo.add(drift)
+            await self.db.commit()
+            logger.warning("Счётчики статусов исправлены: %s", drift)
+        return drift
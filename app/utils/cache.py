@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from app.core.metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+
+class CacheBackend(Protocol):
+    """Интерфейс кэша.
+
+    Методы асинхронные, чтобы in-process реализацию можно было заменить
+    общим кэшем (например, Redis) без изменения сервисов.
+    """
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def generation(self) -> int: ...
+
+    async def set(
+        self, key: str, value: Any, since: int | None = None
+    ) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class LRUCache:
+    """Кэш в памяти процесса с ограничением размера (LRU) и TTL.
+
+    Чтобы медленное чтение не вернуло в кэш данные, удалённые из него
+    после изменения, заполнение версионируется: generation() берётся до
+    чтения из БД, а set(..., since=generation) ничего не записывает, если
+    ключ с тех пор удаляли. Номера удалений хранятся для последних
+    maxsize ключей; про более старые удаления известно лишь, что они были
+    не раньше _forgotten, и такие заполнения тоже пропускаются.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        self._deleted: OrderedDict[str, int] = OrderedDict()
+        self._forgotten = 0
+        self._hits = CACHE_REQUESTS.labels(name, "hit")
+        self._misses = CACHE_REQUESTS.labels(name, "miss")
+        self._evicted_size = CACHE_EVICTIONS.labels(name, "size")
+        self._evicted_ttl = CACHE_EVICTIONS.labels(name, "ttl")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._misses.inc()
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._evicted_ttl.inc()
+            self._misses.inc()
+            return None
+        self._data.move_to_end(key)
+        self._hits.inc()
+        return value
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(
+        self, key: str, value: Any, since: int | None = None
+    ) -> None:
+        if since is not None and (
+            self._forgotten > since or self._deleted.get(key, 0) > since
+        ):
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evicted_size.inc()
+
+    async def delete(self, *keys: str) -> None:
+        self._generation += 1
+        for key in keys:
+            self._data.pop(key, None)
+            self._deleted[key] = self._generation
+            self._deleted.move_to_end(key)
+        while len(self._deleted) > self.maxsize:
+            _, self._forgotten = self._deleted.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        self._forgotten = self._generation
+        self._deleted.clear()
+        self._data.clear()
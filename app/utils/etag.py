@@ -0,0 +1,62 @@
+import hashlib
+from collections.abc import Iterable
+
+# Версия хранится в INTEGER (int4); большие значения не дойдут до БД.
+MAX_VERSION = 2**31 - 1
+
+
+def version_etag(version: int) -> str:
+    """Сильный ETag задачи по номеру её версии."""
+    return f'"{version}"'
+
+
+def parse_version_etag(value: str) -> int | None:
+    """Номер версии из сильного ETag вида "N" или None."""
+    value = value.strip()
+    if len(value) < 3 or value[0] != '"' or value[-1] != '"':
+        return None
+    digits = value[1:-1]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    version = int(digits)
+    return version if version <= MAX_VERSION else None
+
+
+def parse_if_match(header: str) -> list[int] | None:
+    """Версии из If-Match: список сильных ETag через запятую.
+
+    None означает "*" — подходит любая версия. Слабые и чужие ETag
+    пропускаются; пустой список — ни одна версия не подходит.
+    """
+    versions = []
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return None
+        version = parse_version_etag(candidate)
+        if version is not None:
+            versions.append(version)
+    return versions
+
+
+def collection_etag(parts: Iterable[object]) -> str:
+    """Сильный ETag набора объектов по их идентификаторам и версиям."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Совпадает ли etag со значением If-None-Match.
+
+    Сравнение слабое: префикс W/ игнорируется.
+    """
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate in ("*", etag):
+            return True
+    return False
@@ -0,0 +1,58 @@
+import csv
+import io
+from collections.abc import Iterable
+from enum import Enum
+
+from app.schemas.task import TaskOut, TaskOutList
+
+EXPORT_FIELDS = ("id", "title", "description", "status", "version")
+
+
+class DataFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    DataFormat.NDJSON: "application/x-ndjson",
+    DataFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def parse_fields(value: str) -> tuple[str, ...]:
+    """Поля из параметра fields=a,b в порядке EXPORT_FIELDS.
+
+    id возвращается всегда; неизвестное имя поля вызывает ValueError.
+    """
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(EXPORT_FIELDS)
+    if unknown:
+        raise ValueError(", ".join(sorted(unknown)))
+    requested.add("id")
+    return tuple(name for name in EXPORT_FIELDS if name in requested)
+
+
+def csv_header(fields: tuple[str, ...] = EXPORT_FIELDS) -> bytes:
+    return _csv_rows([fields])
+
+
+def encode_chunk(
+    fmt: DataFormat, rows: Iterable, fields: tuple[str, ...] = EXPORT_FIELDS
+) -> bytes:
+    """Закодировать пачку строк задач целиком в один кусок ответа.
+
+    В каждую строку попадают только поля fields, в порядке EXPORT_FIELDS.
+    """
+    tasks = TaskOutList.validate_python(rows)
+    if fmt is DataFormat.NDJSON:
+        to_json = TaskOut.__pydantic_serializer__.to_json
+        include = None if fields == EXPORT_FIELDS else set(fields)
+        return b"".join(to_json(t, include=include) + b"\n" for t in tasks)
+    dumped = TaskOutList.dump_python(tasks, mode="json")
+    return _csv_rows([d[field] for field in fields] for d in dumped)
+
+
+def _csv_rows(rows: Iterable[Iterable]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
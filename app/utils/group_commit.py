@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.metrics import GROUP_COMMIT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    """Group commit: одновременные записи одной пачкой в одной транзакции.
+
+    submit(item) добавляет элемент в текущую пачку и ждёт его результата.
+    Пачка уходит в flush, когда наберёт max_batch элементов или через
+    max_delay секунд после первого элемента; flush получает элементы в
+    порядке submit и возвращает результаты в том же порядке. Если пачка не
+    записалась, её элементы пишутся по одному, и ошибку получает только
+    тот вызов, чей элемент не удалось записать. Элемент, чей вызов
+    отменили до записи, в пачку не попадает.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        flush: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch: int,
+        max_delay: float,
+    ):
+        self.group = group
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._writes: set[asyncio.Task] = set()
+        self._batch_size = GROUP_COMMIT_BATCH_SIZE.labels(group)
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+        return await future
+
+    async def close(self) -> None:
+        """Записать накопленную пачку и дождаться начатых записей."""
+        self._dispatch()
+        if self._writes:
+            await asyncio.gather(*self._writes)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            write = asyncio.create_task(self._write(batch))
+            self._writes.add(write)
+            write.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        self._batch_size.observe(len(batch))
+        try:
+            await self._write_batch(batch)
+        except Exception as e:
+            logger.exception(
+                "Group commit %s: пачка из %s не записана",
+                self.group,
+                len(batch),
+            )
+            _fail(batch, e)
+        finally:
+            # Запись прервали (например, отменили при остановке): ждущие
+            # вызовы не должны зависнуть.
+            _fail(batch, RuntimeError(f"Group commit {self.group} прерван"))
+
+    async def _write_batch(
+        self, batch: list[tuple[Any, asyncio.Future]]
+    ) -> None:
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except Exception:
+            if len(batch) == 1:
+                raise
+            logger.warning(
+                "Group commit %s: пачка из %s не записана, "
+                "элементы пишутся по одному",
+                self.group,
+                len(batch),
+                exc_info=True,
+            )
+            for item, future in batch:
+                await self._write_one(item, future)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def _write_one(self, item: Any, future: asyncio.Future) -> None:
+        if future.done():
+            return
+        try:
+            (result,) = await self.flush([item])
+        except Exception as e:
+            logger.exception("Group commit %s: элемент не записан", self.group)
+            _fail([(item, future)], e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+
+def _fail(batch: list[tuple[Any, asyncio.Future]], error: Exception) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
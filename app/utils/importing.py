@@ -0,0 +1,198 @@
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+from app.core.constants import MAX_CSV_RECORD_LINES, MAX_IMPORT_LINE_BYTES
+from app.utils.export import DataFormat
+
+ImportRecord = tuple[int, dict[str, Any] | ValueError]
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_length: int = MAX_IMPORT_LINE_BYTES
+) -> AsyncIterator[bytes | ValueError]:
+    """Строки из потока байтов, порезанного на произвольные куски.
+
+    Строки не декодируются: ошибку кодировки разбор записывает в отчёт
+    по номеру строки. Строка длиннее max_length байт не накапливается, а
+    отдаётся как ValueError.
+    """
+    pieces: list[bytes] = []
+    size = 0
+    too_long = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            piece = chunk[start:end]
+            if too_long or size + len(piece) > max_length:
+                yield _line_too_long(max_length)
+            else:
+                pieces.append(piece)
+                yield b"".join(pieces).rstrip(b"\r")
+            pieces, size, too_long = [], 0, False
+            start = end + 1
+        if too_long or start == len(chunk):
+            continue
+        size += len(chunk) - start
+        if size > max_length:
+            pieces, too_long = [], True
+        else:
+            pieces.append(chunk[start:])
+    if too_long:
+        yield _line_too_long(max_length)
+    elif pieces:
+        yield b"".join(pieces).rstrip(b"\r")
+
+
+def _line_too_long(max_length: int) -> ValueError:
+    return ValueError(f"Строка длиннее {max_length} байт")
+
+
+def _decode(line: bytes | ValueError) -> str:
+    if isinstance(line, ValueError):
+        raise line
+    try:
+        return line.decode()
+    except UnicodeDecodeError as e:
+        raise ValueError(
+            f"Строка не в кодировке UTF-8 (байт {e.start + 1})"
+        ) from None
+
+
+def _ends_quoted(line: str, quoted: bool) -> bool:
+    """Остаётся ли запись внутри поля в кавычках после line.
+
+    Правила те же, что у csv.reader: кавычка открывает поле только в его
+    начале, "" внутри поля — экранированная кавычка, а кавычка посреди
+    поля без кавычек — обычный символ.
+    """
+    field_start = not quoted
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quoted:
+            if char == '"':
+                if line.startswith('"', i + 1):
+                    i += 1
+                else:
+                    quoted = False
+        elif char == '"' and field_start:
+            quoted = True
+        field_start = not quoted and char == ","
+        i += 1
+    return quoted
+
+
+async def iter_records(
+    fmt: DataFormat,
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int = MAX_IMPORT_LINE_BYTES,
+) -> AsyncIterator[ImportRecord]:
+    """Записи загружаемого файла с номерами строк.
+
+    Нераспознанная строка отдаётся как ValueError, чтобы её можно было
+    показать в отчёте, не прерывая загрузку.
+    """
+    lines = iter_lines(chunks, max_line_bytes)
+    if fmt is DataFormat.NDJSON:
+        async for number, record in _ndjson(lines):
+            yield number, record
+    else:
+        async for number, record in _csv(lines):
+            yield number, record
+
+
+async def _ndjson(
+    lines: AsyncIterator[bytes | ValueError],
+) -> AsyncIterator[ImportRecord]:
+    number = 0
+    async for raw in lines:
+        number += 1
+        try:
+            line = _decode(raw)
+        except ValueError as e:
+            yield number, e
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Некорректный JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield number, ValueError("Ожидался JSON-объект")
+            continue
+        yield number, record
+
+
+async def _csv(
+    lines: AsyncIterator[bytes | ValueError],
+) -> AsyncIterator[ImportRecord]:
+    header: list[str] | None = None
+    async for start, text in _csv_texts(lines):
+        if isinstance(text, ValueError):
+            yield start, text
+            continue
+        if not text.strip():
+            continue
+        try:
+            row = next(csv.reader([text]))
+        except csv.Error as e:
+            yield start, ValueError(f"Некорректная строка CSV: {e}")
+            continue
+        if header is None:
+            header = row
+            continue
+        if len(row) != len(header):
+            yield start, ValueError("Число колонок не совпадает с заголовком")
+            continue
+        yield start, {k: (v if v != "" else None) for k, v in zip(header, row)}
+
+
+async def _csv_texts(
+    lines: AsyncIterator[bytes | ValueError],
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """Тексты записей CSV с номером первой строки каждой записи."""
+    number = start = 0
+    pending: list[str] = []
+    quoted = False
+    async for raw in lines:
+        number += 1
+        if not pending:
+            start = number
+        try:
+            line = _decode(raw)
+        except ValueError as e:
+            # Запись с такой строкой отбрасывается целиком.
+            pending, quoted = [], False
+            yield start, e
+            continue
+        pending.append(line)
+        # Поле в кавычках может содержать перевод строки: запись
+        # продолжается, пока такое поле не закрыто.
+        quoted = _ends_quoted(line, quoted)
+        if not quoted:
+            yield start, "\n".join(pending)
+            pending = []
+        elif len(pending) >= MAX_CSV_RECORD_LINES:
+            pending, quoted = [], False
+            yield start, ValueError(
+                f"Поле в кавычках не закрыто за {MAX_CSV_RECORD_LINES} строк"
+            )
+    if pending:
+        yield start, ValueError("Незакрытая кавычка в конце файла")
+
+
+async def batched(
+    records: AsyncIterable[ImportRecord], size: int
+) -> AsyncIterator[list[ImportRecord]]:
+    batch: list[ImportRecord] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,4 +1,6 @@
-from typing import Generic, TypeVar
+import base64
+import json
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -7,7 +9,39 @@ from app.core.constants import MIN_PAGE_SIZE
 T = TypeVar("T")
 
 
+class InvalidCursorError(ValueError):
+    """Курсор повреждён или не подходит к текущему запросу."""
+
+
 class Page(BaseModel, Generic[T]):
     items: list[T]
-    page: int = Field(MIN_PAGE_SIZE, ge=MIN_PAGE_SIZE)
+    page: int | None = Field(None, ge=MIN_PAGE_SIZE)
     page_size: int = Field(MIN_PAGE_SIZE, ge=MIN_PAGE_SIZE)
+    next_cursor: str | None = Field(
+        None, description="Курсор следующей страницы"
+    )
+    has_next: bool = Field(False, description="Есть ли следующая страница")
+    total: int | None = Field(
+        None, description="Всего элементов (если запрошено with_total)"
+    )
+    total_estimated: bool = Field(
+        False, description="total — оценка планировщика, а не точное число"
+    )
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Упаковать позицию keyset-пагинации в непрозрачную строку."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Распаковать курсор, полученный от клиента."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(payload, dict):
+        raise InvalidCursorError(cursor)
+    return payload
@@ -0,0 +1,27 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """JSON-ответ из готовой pydantic-модели.
+
+    FastAPI проверяет результат эндпоинта по response_model ещё раз и
+    кодирует его через json.dumps; модель, собранная из строк БД, уже
+    валидна, поэтому здесь она сразу сериализуется в байты её
+    скомпилированным сериализатором. response_model у маршрута остаётся
+    ради схемы OpenAPI. exclude убирает поля из ответа так же, как в
+    model_dump_json.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: BaseModel, exclude: Any = None, **kwargs):
+        self.exclude = exclude
+        super().__init__(content, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(
+            content, exclude=self.exclude
+        )
@@ -0,0 +1,50 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.metrics import COALESCED_CALLS
+
+
+class SingleFlight:
+    """Объединение одновременных одинаковых вызовов.
+
+    Пока вызов с ключом key выполняется, остальные вызовы с тем же ключом
+    не запускают fn, а ждут результата первого. Отмена одного ожидающего
+    не отменяет общий вызов; при отмене первого остальные повторяют
+    попытку сами.
+    """
+
+    def __init__(self, group: str):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._coalesced = COALESCED_CALLS.labels(group)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]):
+        while (future := self._calls.get(key)) is not None:
+            self._coalesced.inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or _is_cancelling():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Ошибку получает вызывающий; ожидающих может не быть.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+def _is_cancelling() -> bool:
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
@@ -0,0 +1,103 @@
+"""Чтение задач ORM-объектами Task и Core-запросом в TaskRow.
+
+Сравнивается то, что тратится на стороне Python: создание Task в
+identity map против TaskRow из колонок READ_COLUMNS, плюс проверка в
+TaskOut, как в ответе API. База — sqlite в памяти из стандартной
+библиотеки, поэтому сеть и драйвер Postgres не влияют на результат.
+Память — пик tracemalloc на одно чтение.
+
+    python -m benchmarks.orm_rows --rows 10000 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.task_repository import READ_COLUMNS, TaskRow
+from app.schemas.task import TaskOutList
+
+DDL = """
+CREATE TABLE tasks (
+    id CHAR(32) PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    status VARCHAR(11) NOT NULL,
+    version INTEGER NOT NULL,
+    search_vector TEXT
+)
+"""
+
+
+def _fill(session: Session, count: int) -> None:
+    session.connection().exec_driver_sql(DDL)
+    statuses = list(TaskStatus)
+    session.execute(
+        insert(Task.__table__),
+        [
+            {
+                "id": uuid.uuid4(),
+                "title": f"Задача {i}",
+                "description": "Описание задачи " * 4,
+                "status": statuses[i % len(statuses)],
+                "version": 1,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+def _orm(session: Session) -> int:
+    tasks = session.execute(select(Task).order_by(Task.id)).scalars().all()
+    out = TaskOutList.validate_python(tasks)
+    session.expunge_all()
+    return len(out)
+
+
+def _core(session: Session) -> int:
+    result = session.execute(select(*READ_COLUMNS).order_by(Task.id))
+    tasks = [TaskRow(*row) for row in result]
+    return len(TaskOutList.validate_python(tasks))
+
+
+def _measure(
+    name: str, read: Callable[[Session], int], session: Session, repeat: int
+) -> None:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = read(session)
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    read(session)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    median = statistics.median(samples)
+    print(
+        f"{name:<5} {rows / median:10.0f} строк/с "
+        f"median={median * 1000:.1f} мс peak={peak / 2**20:.1f} МиБ"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.orm_rows")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        _fill(session, args.rows)
+        _measure("orm", _orm, session, args.repeat)
+        _measure("core", _core, session, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
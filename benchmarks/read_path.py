@@ -0,0 +1,99 @@
+"""Чтение задачи в транзакции и без неё (AUTOCOMMIT).
+
+Каждый «запрос» открывает сессию, читает задачу по id и закрывает
+сессию — как GET /api/v1/tasks/{id}. Для каждого режима печатаются
+задержка запроса и время, на которое он занимает соединение пула.
+
+Нужна база с применёнными миграциями:
+
+    export BENCH_DATABASE_URL=postgresql+asyncpg://localhost/task_manager
+    python -m benchmarks.read_path --requests 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.models.task import Task
+
+MODES = {
+    "transaction": {},
+    "autocommit": {"isolation_level": "AUTOCOMMIT"},
+}
+
+
+def _percentiles(samples: list[float]) -> str:
+    quantiles = statistics.quantiles(samples, n=100)
+    return (
+        f"p50={quantiles[49] * 1000:.3f} мс "
+        f"p95={quantiles[94] * 1000:.3f} мс "
+        f"p99={quantiles[98] * 1000:.3f} мс"
+    )
+
+
+async def run(url: str, mode: str, requests: int, concurrency: int) -> None:
+    engine = create_async_engine(
+        url, pool_size=concurrency, max_overflow=0
+    ).execution_options(**MODES[mode])
+    holds: list[float] = []
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):  # noqa: ARG001
+        record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, record):  # noqa: ARG001
+        holds.append(time.perf_counter() - record.info.pop("checked_out_at"))
+
+    factory = async_sessionmaker(engine, class_=AsyncSession)
+    async with factory() as session:
+        task_id = await session.scalar(select(Task.id).limit(1))
+    if task_id is None:
+        raise SystemExit("В базе нет задач: создайте хотя бы одну")
+
+    latencies: list[float] = []
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in queue:
+            started = time.perf_counter()
+            async with factory() as session:
+                await session.get(Task, task_id)
+            latencies.append(time.perf_counter() - started)
+
+    holds.clear()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    print(
+        f"{mode:<12} {requests / elapsed:8.0f} запр/с | "
+        f"задержка {_percentiles(latencies)} | "
+        f"удержание соединения {_percentiles(holds)}"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.read_path")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("укажите --url или BENCH_DATABASE_URL")
+    for mode in MODES:
+        asyncio.run(run(args.url, mode, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Сериализация страницы задач: путь FastAPI по response_model и прямой.
+
+База не нужна: задачи собираются в памяти как ORM-объекты Task.
+«before» повторяет прежний путь — model_validate на каждую задачу,
+повторная проверка по response_model и json.dumps в JSONResponse;
+«after» — одна проверка через TaskOutList и ModelResponse. Для выгрузки
+сравнивается кодирование одной пачки NDJSON.
+
+    python -m benchmarks.serialization --page-size 200 --repeat 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.db.enums import TaskStatus
+from app.main import get_application
+from app.models.task import Task
+from app.schemas.task import TaskOut, TaskOutList
+from app.utils.export import DataFormat, encode_chunk
+from app.utils.pagination import Page
+from app.utils.responses import ModelResponse
+
+
+def _tasks(count: int) -> list[Task]:
+    statuses = list(TaskStatus)
+    return [
+        Task(
+            id=uuid.uuid4(),
+            title=f"Задача {i}",
+            description="Описание задачи " * 4,
+            status=statuses[i % len(statuses)],
+            version=i,
+        )
+        for i in range(count)
+    ]
+
+
+def _list_route() -> APIRoute:
+    for route in get_application().routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.name == "list_tasks"
+            and "GET" in route.methods
+        ):
+            return route
+    raise LookupError("list_tasks")
+
+
+async def _before(route: APIRoute, tasks: list[Task]) -> bytes:
+    page = Page[TaskOut](
+        items=[TaskOut.model_validate(t) for t in tasks],
+        page_size=len(tasks),
+    )
+    content = await serialize_response(
+        field=route.response_field, response_content=page, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+async def _after(route: APIRoute, tasks: list[Task]) -> bytes:  # noqa: ARG001
+    page = Page[TaskOut](
+        items=TaskOutList.validate_python(tasks), page_size=len(tasks)
+    )
+    return ModelResponse(page).body
+
+
+def _export_before(tasks: list[Task]) -> bytes:
+    return b"".join(
+        TaskOut.model_validate(t).model_dump_json().encode() + b"\n"
+        for t in tasks
+    )
+
+
+def _export_after(tasks: list[Task]) -> bytes:
+    return encode_chunk(DataFormat.NDJSON, tasks)
+
+
+def _report(name: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    print(f"{name:<16} median={median * 1000:.3f} мс")
+    return median
+
+
+async def run(page_size: int, repeat: int) -> None:
+    route = _list_route()
+    tasks = _tasks(page_size)
+    assert await _before(route, tasks) == await _after(route, tasks)
+
+    results = {}
+    for name, step in (("list before", _before), ("list after", _after)):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await step(route, tasks)
+            samples.append(time.perf_counter() - started)
+        results[name] = _report(name, samples)
+    for name, encode in (
+        ("export before", _export_before),
+        ("export after", _export_after),
+    ):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            encode(tasks)
+            samples.append(time.perf_counter() - started)
+        results[name] = _report(name, samples)
+
+    for kind in ("list", "export"):
+        speedup = results[f"{kind} before"] / results[f"{kind} after"]
+        print(f"{kind}: x{speedup:.1f}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
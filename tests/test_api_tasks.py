@@ -7,9 +7,12 @@ from httpx import AsyncClient
 from httpx._transports.asgi import ASGITransport
 from starlette import status
 
-from app.db.db import get_async_session
-from app.db.enums import TaskStatus
+from app.core.constants import MAX_BULK_ITEMS
+from app.db.db import get_async_session, get_read_session
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
 from app.main import get_application
+from app.services.task_service import VersionConflictError
+from app.utils.pagination import InvalidCursorError
 
 
 @pytest.fixture
@@ -24,6 +27,7 @@ def client_and_service():
         yield AsyncMock(name="DummySession")
 
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
 
     service_mock = AsyncMock(name="TaskServiceMock")
 
@@ -87,7 +91,7 @@ async def test_get_task_ok(client_and_service):
     data = resp.json()
     assert data["id"] == str(tid)
     assert data["title"] == "Получить"
-    service.get.assert_called_once_with(tid)
+    service.get.assert_called_once_with(tid, description=True)
 
 
 @pytest.mark.asyncio
@@ -100,7 +104,7 @@ async def test_get_task_not_found(client_and_service):
     resp = await client.get(f"/api/v1/tasks/{tid}")
     assert resp.status_code == status.HTTP_404_NOT_FOUND
     assert resp.json()["detail"] == "Задача не найдена"
-    service.get.assert_called_once_with(tid)
+    service.get.assert_called_once_with(tid, description=True)
 
 
 @pytest.mark.asyncio
@@ -120,7 +124,14 @@ async def test_list_tasks_ok(client_and_service):
         "Задача 1",
         "Задача 2",
     ]
-    service.list.assert_called_once_with(page=1, page_size=10)
+    service.list.assert_called_once_with(
+        page=1,
+        page_size=10,
+        status=None,
+        sort=TaskSortField.ID,
+        order=SortOrder.ASC,
+        description=True,
+    )
 
 
 @pytest.mark.asyncio
@@ -176,3 +187,474 @@ async def test_delete_task_not_found(client_and_service):
     assert resp.status_code == status.HTTP_404_NOT_FOUND
     assert resp.json()["detail"] == "Задача не найдена"
     service.delete.assert_called_once_with(tid)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_mode(client_and_service):
+    client, service = client_and_service
+
+    t1 = _task_dict(title="Задача 1")
+    service.list_after.return_value = ([t1], "next")
+
+    resp = await client.get(
+        "/api/v1/tasks/?cursor=abc&page_size=1"
+        "&status=Создано&sort=title&order=desc"
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert data["page"] is None
+    assert data["next_cursor"] == "next"
+    assert data["has_next"] is True
+    assert [item["title"] for item in data["items"]] == ["Задача 1"]
+    service.list_after.assert_called_once_with(
+        cursor="abc",
+        page_size=1,
+        status=TaskStatus.CREATED,
+        sort=TaskSortField.TITLE,
+        order=SortOrder.DESC,
+        description=True,
+    )
+    service.list.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_cursor(client_and_service):
+    client, service = client_and_service
+
+    service.list_after.side_effect = InvalidCursorError("bad")
+
+    resp = await client.get("/api/v1/tasks/?cursor=bad")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert resp.json()["detail"] == "Некорректный курсор"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_results(client_and_service):
+    client, service = client_and_service
+
+    created = _task_dict(title="Первая")
+    service.create_many.return_value = [created]
+
+    resp = await client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": "Первая"}, {"title": ""}],
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 1
+    ok, bad = data["items"]
+    assert ok["index"] == 0 and ok["ok"] is True
+    assert ok["task"]["id"] == str(created["id"])
+    assert bad["index"] == 1 and bad["ok"] is False
+    assert bad["errors"][0]["loc"] == ["title"]
+    service.create_many.assert_called_once()
+    (items,) = service.create_many.call_args.args
+    assert [item.title for item in items] == ["Первая"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_all_invalid_skips_db(client_and_service):
+    client, service = client_and_service
+
+    resp = await client.post(
+        "/api/v1/tasks/bulk", json=[{"description": "x"}, "not an object"]
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["created"] == 0
+    assert resp.json()["failed"] == 2
+    service.create_many.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_openapi_references_task_create(client_and_service):
+    client, _ = client_and_service
+
+    schema = (await client.get("/openapi.json")).json()
+
+    body = schema["paths"]["/api/v1/tasks/bulk"]["post"]["requestBody"]
+    items = body["content"]["application/json"]["schema"]["items"]
+    assert items == {"$ref": "#/components/schemas/TaskCreate"}
+    assert "TaskCreate" in schema["components"]["schemas"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_splits_deleted_and_missing(client_and_service):
+    client, service = client_and_service
+
+    gone, missing = uuid.uuid4(), uuid.uuid4()
+    service.delete_many.return_value = [gone]
+
+    resp = await client.request(
+        "DELETE",
+        "/api/v1/tasks/",
+        json={"ids": [str(gone), str(missing), str(gone)]},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {"deleted": [str(gone)], "not_found": [str(missing)]}
+    service.delete_many.assert_called_once_with([gone, missing])
+
+
+@pytest.mark.asyncio
+async def test_transition_reports_skipped_ids(client_and_service):
+    client, service = client_and_service
+
+    claimed = _task_dict(status=TaskStatus.IN_PROGRESS)
+    other = uuid.uuid4()
+    service.transition.return_value = [claimed]
+
+    resp = await client.post(
+        "/api/v1/tasks/transition",
+        json={
+            "ids": [str(claimed["id"]), str(other)],
+            "status": TaskStatus.IN_PROGRESS,
+            "expected_status": TaskStatus.CREATED,
+        },
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert [t["id"] for t in data["updated"]] == [str(claimed["id"])]
+    assert data["skipped"] == [str(other)]
+    service.transition.assert_called_once_with(
+        TaskStatus.IN_PROGRESS,
+        ids=[claimed["id"], other],
+        expected_status=TaskStatus.CREATED,
+        limit=MAX_BULK_ITEMS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_transition_by_status_is_limited(client_and_service):
+    client, service = client_and_service
+    service.transition.return_value = []
+
+    resp = await client.post(
+        "/api/v1/tasks/transition",
+        json={
+            "status": TaskStatus.COMPLETED,
+            "expected_status": TaskStatus.IN_PROGRESS,
+            "limit": 50,
+        },
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert service.transition.call_args.kwargs["limit"] == 50
+
+    resp = await client.post(
+        "/api/v1/tasks/transition",
+        json={
+            "status": TaskStatus.COMPLETED,
+            "expected_status": TaskStatus.IN_PROGRESS,
+            "limit": MAX_BULK_ITEMS + 1,
+        },
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_transition_requires_ids_or_expected_status(client_and_service):
+    client, service = client_and_service
+
+    resp = await client.post(
+        "/api/v1/tasks/transition", json={"status": TaskStatus.COMPLETED}
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    service.transition.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_claim_tasks(client_and_service):
+    client, service = client_and_service
+
+    claimed = _task_dict(status=TaskStatus.IN_PROGRESS)
+    service.claim.return_value = [claimed]
+
+    resp = await client.post("/api/v1/tasks/claim?limit=3")
+    assert resp.status_code == status.HTTP_200_OK
+    assert [t["id"] for t in resp.json()] == [str(claimed["id"])]
+    service.claim.assert_called_once_with(3)
+
+
+@pytest.mark.asyncio
+async def test_get_task_sets_etag(client_and_service):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.get.return_value = {**_task_dict(id_=tid), "version": 3}
+
+    resp = await client.get(f"/api/v1/tasks/{tid}")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["ETag"] == '"3"'
+    service.get_version.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_task_not_modified_uses_version_lookup(client_and_service):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.get_version.return_value = 3
+
+    resp = await client.get(
+        f"/api/v1/tasks/{tid}", headers={"If-None-Match": '"3"'}
+    )
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp.content == b""
+    assert resp.headers["ETag"] == '"3"'
+    service.get_version.assert_called_once_with(tid)
+    service.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_task_stale_etag_returns_body(client_and_service):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.get_version.return_value = 4
+    service.get.return_value = {**_task_dict(id_=tid), "version": 4}
+
+    resp = await client.get(
+        f"/api/v1/tasks/{tid}", headers={"If-None-Match": '"3"'}
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["ETag"] == '"4"'
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_conditional_get(client_and_service):
+    client, service = client_and_service
+
+    service.list_after.return_value = ([_task_dict()], None)
+
+    first = await client.get("/api/v1/tasks/")
+    etag = first.headers["ETag"]
+    second = await client.get(
+        "/api/v1/tasks/", headers={"If-None-Match": etag}
+    )
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second.content == b""
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match_passes_expected_version(
+    client_and_service,
+):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.update.return_value = {**_task_dict(id_=tid), "version": 4}
+
+    resp = await client.patch(
+        f"/api/v1/tasks/{tid}",
+        json={"title": "Новая"},
+        headers={"If-Match": '"3"'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["ETag"] == '"4"'
+    assert service.update.call_args.kwargs == {"expected_versions": [3]}
+
+
+@pytest.mark.asyncio
+async def test_update_task_version_conflict(client_and_service):
+    client, service = client_and_service
+
+    service.update.side_effect = VersionConflictError("conflict")
+
+    resp = await client.patch(
+        f"/api/v1/tasks/{uuid.uuid4()}",
+        json={"title": "Новая"},
+        headers={"If-Match": '"3"'},
+    )
+    assert resp.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+
+@pytest.mark.asyncio
+async def test_update_task_weak_if_match_fails(client_and_service):
+    client, service = client_and_service
+
+    resp = await client.patch(
+        f"/api/v1/tasks/{uuid.uuid4()}",
+        json={"title": "Новая"},
+        headers={"If-Match": 'W/"3"'},
+    )
+    assert resp.status_code == status.HTTP_412_PRECONDITION_FAILED
+    service.update.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "if_match", ['"\u00b2"'.encode("latin-1"), f'"{2**31}"', '"abc"']
+)
+async def test_update_task_invalid_if_match_fails(
+    client_and_service, if_match
+):
+    client, service = client_and_service
+
+    resp = await client.patch(
+        f"/api/v1/tasks/{uuid.uuid4()}",
+        json={"title": "Новая"},
+        headers={"If-Match": if_match},
+    )
+    assert resp.status_code == status.HTTP_412_PRECONDITION_FAILED
+    service.update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match_list(client_and_service):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.update.return_value = {**_task_dict(id_=tid), "version": 4}
+
+    resp = await client.patch(
+        f"/api/v1/tasks/{tid}",
+        json={"title": "Новая"},
+        headers={"If-Match": 'W/"1", "2" , "3"'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert service.update.call_args.kwargs == {"expected_versions": [2, 3]}
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_ok(client_and_service):
+    client, service = client_and_service
+
+    t1 = _task_dict(title="Квартальный отчёт")
+    service.search.return_value = ([t1], "next")
+
+    resp = await client.get("/api/v1/tasks/search?q=отч&page_size=1")
+    assert resp.status_code == status.HTTP_200_OK
+    data = resp.json()
+    assert [item["title"] for item in data["items"]] == ["Квартальный отчёт"]
+    assert data["next_cursor"] == "next"
+    assert data["has_next"] is True
+    service.search.assert_called_once_with("отч", cursor=None, page_size=1)
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_requires_query(client_and_service):
+    client, service = client_and_service
+
+    resp = await client.get("/api/v1/tasks/search?q=")
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    service.search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_invalid_cursor(client_and_service):
+    client, service = client_and_service
+
+    service.search.side_effect = InvalidCursorError("bad")
+
+    resp = await client.get("/api/v1/tasks/search?q=отчёт&cursor=bad")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert resp.json()["detail"] == "Некорректный курсор"
+
+
+@pytest.mark.asyncio
+async def test_suggest_tasks_ok(client_and_service):
+    client, service = client_and_service
+
+    tid = uuid.uuid4()
+    service.suggest.return_value = [{"id": tid, "title": "Задача 1"}]
+
+    resp = await client.get("/api/v1/tasks/suggest?prefix=зад&limit=5")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == [{"id": str(tid), "title": "Задача 1"}]
+    service.suggest.assert_called_once_with("зад", limit=5)
+
+
+@pytest.mark.asyncio
+async def test_suggest_tasks_limit_is_bounded(client_and_service):
+    client, service = client_and_service
+
+    resp = await client.get("/api/v1/tasks/suggest?prefix=з&limit=1000")
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    service.suggest.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_endpoints_skip_response_model_revalidation(
+    client_and_service,
+):
+    client, service = client_and_service
+    task = _task_dict(title="Без повторной проверки")
+    service.get.return_value = task
+    service.list_after.return_value = ([task], None)
+    service.search.return_value = ([task], None)
+
+    with patch("fastapi.routing.serialize_response") as serialize:
+        got = await client.get(f"/api/v1/tasks/{task['id']}")
+        listed = await client.get("/api/v1/tasks/")
+        found = await client.get("/api/v1/tasks/search?q=без")
+
+    serialize.assert_not_called()
+    assert got.json()["status"] == "Создано"
+    assert got.headers["content-type"] == "application/json"
+    assert listed.json()["items"] == [got.json()]
+    assert "ETag" in listed.headers
+    assert found.json()["items"] == [got.json()]
+
+
+@pytest.mark.asyncio
+async def test_fields_trim_response_and_skip_description(client_and_service):
+    client, service = client_and_service
+    task = _task_dict()
+    service.get.return_value = task
+    service.list_after.return_value = ([task], None)
+
+    got = await client.get(f"/api/v1/tasks/{task['id']}?fields=title")
+    listed = await client.get("/api/v1/tasks/?fields=title,status")
+    bad = await client.get("/api/v1/tasks/?fields=title,body")
+
+    assert got.json() == {"id": str(task["id"]), "title": task["title"]}
+    service.get.assert_called_once_with(task["id"], description=False)
+    assert listed.json()["items"] == [
+        {"id": str(task["id"]), "title": task["title"], "status": "Создано"}
+    ]
+    assert listed.json()["page_size"] == 20
+    assert service.list_after.call_args.kwargs["description"] is False
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+    assert bad.json()["detail"] == "Неизвестные поля: body"
+
+
+@pytest.mark.asyncio
+async def test_batch_get_preserves_order_and_reports_missing(
+    client_and_service,
+):
+    client, service = client_and_service
+    first, second = _task_dict(title="Первая"), _task_dict(title="Вторая")
+    missing = uuid.uuid4()
+    service.get_many.return_value = {
+        first["id"]: first,
+        second["id"]: second,
+    }
+    ids = [second["id"], missing, first["id"], second["id"]]
+
+    resp = await client.post(
+        "/api/v1/tasks/batch-get?fields=title",
+        json={"ids": [str(i) for i in ids]},
+    )
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {
+        "items": [
+            {"id": str(second["id"]), "title": "Вторая"},
+            {"id": str(first["id"]), "title": "Первая"},
+        ],
+        "not_found": [str(missing)],
+    }
+    service.get_many.assert_awaited_once_with(
+        [second["id"], missing, first["id"]], description=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_get_limits_number_of_ids(client_and_service):
+    client, _ = client_and_service
+
+    resp = await client.post(
+        "/api/v1/tasks/batch-get",
+        json={"ids": [str(uuid.uuid4()) for _ in range(501)]},
+    )
+
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import generate_latest
+
+from app.utils.cache import LRUCache
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    cache = LRUCache("test", maxsize=2, ttl=60)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1
+
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = LRUCache("test", maxsize=2, ttl=10)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        await cache.set("a", 1)
+    with patch("app.utils.cache.time.monotonic", return_value=109.0):
+        assert await cache.get("a") == 1
+    with patch("app.utils.cache.time.monotonic", return_value=110.0):
+        assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_and_clear():
+    cache = LRUCache("test", maxsize=10, ttl=60)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+
+    await cache.delete("a", "missing")
+    assert await cache.get("a") is None
+    await cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_set_since_skips_keys_deleted_after_generation():
+    cache = LRUCache("test", maxsize=1, ttl=60)
+    generation = await cache.generation()
+    await cache.delete("a")
+
+    await cache.set("a", 1, since=generation)
+    await cache.set("b", 2, since=generation)
+    assert await cache.get("a") is None
+    assert await cache.get("b") == 2
+
+    # Номер удаления "a" вытеснен: заполнения до него тоже пропускаются.
+    await cache.delete("c")
+    await cache.set("a", 1, since=generation)
+    assert await cache.get("a") is None
+    await cache.set("a", 1, since=await cache.generation())
+    assert await cache.get("a") == 1
+
+
+@pytest.mark.asyncio
+async def test_counters_exported_to_prometheus():
+    cache = LRUCache("metrics_test", maxsize=1, ttl=60)
+    await cache.set("a", 1)
+    await cache.get("a")
+    await cache.get("b")
+    await cache.set("b", 2)
+
+    metrics = generate_latest().decode()
+    for line in (
+        'app_cache_requests_total{cache="metrics_test",result="hit"} 1.0',
+        'app_cache_requests_total{cache="metrics_test",result="miss"} 1.0',
+        'app_cache_evictions_total{cache="metrics_test",reason="size"} 1.0',
+    ):
+        assert line in metrics
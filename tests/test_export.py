@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from starlette import status
+
+from app.db.db import get_read_session_factory
+from app.db.enums import TaskStatus
+from app.main import get_application
+from app.schemas.task import TaskOut
+from app.services.task_service import TaskService
+from app.utils.export import (
+    EXPORT_FIELDS,
+    DataFormat,
+    csv_header,
+    encode_chunk,
+    parse_fields,
+)
+
+
+def _task(title: str = "Задача") -> TaskOut:
+    return TaskOut(
+        id=uuid.uuid4(),
+        title=title,
+        description='с "кавычками", и запятой',
+        status=TaskStatus.CREATED,
+        version=1,
+    )
+
+
+def test_encode_ndjson_chunk():
+    tasks = [_task("a"), _task("b")]
+
+    lines = encode_chunk(DataFormat.NDJSON, tasks).decode().splitlines()
+
+    assert [json.loads(line)["title"] for line in lines] == ["a", "b"]
+
+
+def test_encode_csv_chunk_escapes_values():
+    task = _task()
+    body = csv_header() + encode_chunk(DataFormat.CSV, [task])
+
+    header, row = csv.reader(io.StringIO(body.decode()))
+
+    assert header == ["id", "title", "description", "status", "version"]
+    assert row == [
+        str(task.id),
+        task.title,
+        task.description,
+        TaskStatus.CREATED.value,
+        "1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_export_streams_batches():
+    repo = MagicMock()
+    batches = [[_task("a")], [_task("b")]]
+
+    async def stream(batch_size, status=None, description=True):
+        assert batch_size == 2
+        assert status is TaskStatus.COMPLETED
+        assert description is True
+        for batch in batches:
+            yield batch
+
+    repo.stream = stream
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock())
+        chunks = [
+            c
+            async for c in svc.export(
+                DataFormat.CSV, TaskStatus.COMPLETED, chunk_rows=2
+            )
+        ]
+
+    assert len(chunks) == 3
+    assert chunks[0] == csv_header()
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_with_own_session():
+    app = get_application()
+    session = AsyncMock(name="ExportSession")
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    app.dependency_overrides[get_read_session_factory] = lambda: factory
+    service = MagicMock()
+
+    async def export(fmt, task_status, fields):
+        assert fmt is DataFormat.NDJSON
+        assert task_status is None
+        assert fields == EXPORT_FIELDS
+        yield b'{"a":1}\n'
+        yield b'{"a":2}\n'
+
+    service.export = export
+
+    with patch(
+        "app.api.v1.tasks.TaskService", return_value=service
+    ) as service_cls:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            resp = await client.get("/api/v1/tasks/export?format=ndjson")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.text == '{"a":1}\n{"a":2}\n'
+    service_cls.assert_called_once_with(session)
+
+
+def test_encode_chunk_keeps_only_requested_fields():
+    task = _task()
+    fields = parse_fields("status, title")
+
+    line = encode_chunk(DataFormat.NDJSON, [task], fields)
+    body = csv_header(fields) + encode_chunk(DataFormat.CSV, [task], fields)
+
+    assert fields == ("id", "title", "status")
+    assert json.loads(line) == {
+        "id": str(task.id),
+        "title": task.title,
+        "status": TaskStatus.CREATED.value,
+    }
+    assert list(csv.reader(io.StringIO(body.decode()))) == [
+        ["id", "title", "status"],
+        [str(task.id), task.title, TaskStatus.CREATED.value],
+    ]
+    with pytest.raises(ValueError, match="body"):
+        parse_fields("title,body")
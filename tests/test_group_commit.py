@@ -0,0 +1,146 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+from app.utils.group_commit import GroupCommitter
+
+
+def _recording(batches: list[list]):
+    async def flush(items):
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    return flush
+
+
+def _batch_sizes(group: str) -> tuple[float, float]:
+    labels = {"group": group}
+    return (
+        REGISTRY.get_sample_value("app_group_commit_batch_size_count", labels)
+        or 0.0,
+        REGISTRY.get_sample_value("app_group_commit_batch_size_sum", labels)
+        or 0.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_at_once_with_own_results():
+    batches = []
+    committer = GroupCommitter("test_size", _recording(batches), 3, 0.01)
+    count, total = _batch_sizes("test_size")
+
+    results = await asyncio.gather(*(committer.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1, 2], [3, 4]]
+    assert _batch_sizes("test_size") == (count + 2, total + 5)
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_waits_at_most_max_delay():
+    batches = []
+    committer = GroupCommitter("test_delay", _recording(batches), 100, 0.01)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(committer.submit(1), committer.submit(2)), timeout=1
+    )
+
+    assert results == [10, 20]
+    assert batches == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_flush_error_reaches_every_waiter():
+    async def fail(_items):
+        raise RuntimeError("db down")
+
+    committer = GroupCommitter("test_error", fail, 2, 60)
+
+    results = await asyncio.gather(
+        committer.submit(1), committer.submit(2), return_exceptions=True
+    )
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_item_by_item():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        if "bad" in items:
+            raise ValueError("bad row")
+        return [item.upper() for item in items]
+
+    committer = GroupCommitter("test_retry", flush, 3, 60)
+
+    results = await asyncio.gather(
+        *(committer.submit(item) for item in ("a", "bad", "c")),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "A" and results[2] == "C"
+    assert isinstance(results[1], ValueError)
+    assert batches == [["a", "bad", "c"], ["a"], ["bad"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_write_resolves_waiters():
+    started = asyncio.Event()
+
+    async def hang(_items):
+        started.set()
+        await asyncio.Event().wait()
+
+    committer = GroupCommitter("test_abort", hang, 2, 60)
+    waiters = asyncio.gather(
+        committer.submit(1), committer.submit(2), return_exceptions=True
+    )
+    await started.wait()
+    for write in committer._writes:
+        write.cancel()
+
+    results = await asyncio.wait_for(waiters, timeout=1)
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_submit_is_left_out_and_close_flushes_rest():
+    batches = []
+    committer = GroupCommitter("test_close", _recording(batches), 100, 60)
+
+    cancelled = asyncio.create_task(committer.submit(1))
+    kept = asyncio.create_task(committer.submit(2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    await committer.close()
+
+    assert await kept == 20
+    assert batches == [[2]]
+
+
+@pytest.mark.asyncio
+async def test_service_create_goes_through_group_commit_when_enabled():
+    committer = AsyncMock()
+    committer.submit.return_value = "task"
+    db = AsyncMock()
+
+    with (
+        patch("app.services.task_service._create_commits", committer),
+        patch("app.services.task_service.TaskRepository") as repo_cls,
+    ):
+        svc = TaskService(db)
+        out = await svc.create(TaskCreate(title="t", description=None))
+
+    assert out == "task"
+    (values,) = committer.submit.await_args.args
+    assert values["title"] == "t"
+    repo_cls.return_value.create.assert_not_called()
+    db.commit.assert_not_called()
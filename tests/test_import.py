@@ -0,0 +1,225 @@
+import csv
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncpg
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from starlette import status
+
+from app.core.constants import MAX_CSV_RECORD_LINES, MAX_IMPORT_BATCH_SIZE
+from app.db.db import get_async_session
+from app.main import get_application
+from app.repositories.task_repository import COPY_COLUMNS, TaskRepository
+from app.schemas.task import TaskImportReport
+from app.services.task_service import TaskService
+from app.utils.export import DataFormat
+from app.utils.importing import iter_records
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _collect(fmt: DataFormat, *parts: bytes):
+    return [r async for r in iter_records(fmt, _chunks(*parts))]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_across_chunk_boundaries():
+    records = await _collect(
+        DataFormat.NDJSON, b'{"title": "a"}\n{"ti', b'tle": "b"}\n\nnope\n'
+    )
+
+    assert records[:2] == [(1, {"title": "a"}), (2, {"title": "b"})]
+    line, error = records[2]
+    assert line == 4 and isinstance(error, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_csv_records_with_quoted_newlines():
+    records = await _collect(
+        DataFormat.CSV,
+        b'title,description\r\na,"multi\nline, ""quoted"""\r\n',
+        b"b,\nc\n",
+    )
+
+    assert records[0] == (
+        2,
+        {"title": "a", "description": 'multi\nline, "quoted"'},
+    )
+    assert records[1] == (4, {"title": "b", "description": None})
+    assert records[2][0] == 5 and isinstance(records[2][1], ValueError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", [DataFormat.NDJSON, DataFormat.CSV])
+async def test_invalid_utf8_line_is_reported_and_skipped(fmt):
+    header = b"title\n" if fmt is DataFormat.CSV else b""
+    first, bad, last = (
+        (b"a", b"\xff", b"b")
+        if fmt is DataFormat.CSV
+        else (b'{"title": "a"}', b'{"title": "\xff"}', b'{"title": "b"}')
+    )
+    offset = 1 if header else 0
+    records = await _collect(fmt, header + b"\n".join([first, bad, last]))
+
+    assert records[0] == (1 + offset, {"title": "a"})
+    line, error = records[1]
+    assert line == 2 + offset and isinstance(error, ValueError)
+    assert "UTF-8" in str(error)
+    assert records[2] == (3 + offset, {"title": "b"})
+
+
+@pytest.mark.asyncio
+async def test_csv_stray_quotes_stay_in_their_field():
+    records = await _collect(
+        DataFormat.CSV, b'title\n5" screen\nnext\nlast "q\nz\n'
+    )
+
+    assert records == [
+        (2, {"title": '5" screen'}),
+        (3, {"title": "next"}),
+        (4, {"title": 'last "q'}),
+        (5, {"title": "z"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_unclosed_quote_is_capped_and_parse_errors_reported():
+    unclosed = b'title\n"open\n' + b"x\n" * MAX_CSV_RECORD_LINES + b"after\n"
+    records = await _collect(DataFormat.CSV, unclosed)
+
+    line, error = records[0]
+    assert line == 2 and isinstance(error, ValueError)
+    assert records[-1] == (MAX_CSV_RECORD_LINES + 3, {"title": "after"})
+
+    huge = b"title\n" + b"a" * (csv.field_size_limit() + 1) + b"\nb\n"
+    records = await _collect(DataFormat.CSV, huge)
+    assert isinstance(records[0][1], ValueError)
+    assert records[1] == (3, {"title": "b"})
+
+
+@pytest.mark.asyncio
+async def test_long_lines_are_reported_without_buffering():
+    chunks = [b'{"title": "a"}\n', *[b"x" * 10] * 5, b"\n", b'{"title": "b"}']
+    records = [
+        r async for r in iter_records(DataFormat.NDJSON, _chunks(*chunks), 20)
+    ]
+
+    assert records[0] == (1, {"title": "a"})
+    line, error = records[1]
+    assert line == 2 and "длиннее 20" in str(error)
+    assert records[2] == (3, {"title": "b"})
+
+
+@pytest.mark.asyncio
+async def test_service_import_validates_and_copies_per_batch():
+    db = AsyncMock()
+    repo = AsyncMock()
+    records = _chunks(
+        b'{"title": "a"}\n{"title": ""}\n{"title": "b"}\n{"title": "c"}\n'
+    )
+    progress = []
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        report = await svc.import_tasks(
+            iter_records(DataFormat.NDJSON, records),
+            batch_size=2,
+            on_batch=lambda _, total: progress.append(total.inserted),
+        )
+
+    assert (report.rows, report.inserted, report.failed) == (4, 3, 1)
+    assert [b.inserted for b in report.batches] == [1, 2]
+    assert report.batches[0].errors[0].line == 2
+    assert progress == [1, 3]
+    assert report.rows_per_second > 0
+    first_rows = repo.copy_rows.call_args_list[0].args[0]
+    assert [row[1:] for row in first_rows] == [("a", None, "CREATED")]
+    assert db.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_service_import_reports_failed_batch_and_continues():
+    db = AsyncMock()
+    repo = AsyncMock()
+    repo.copy_rows.side_effect = [asyncpg.PostgresError("boom"), None]
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        report = await svc.import_tasks(
+            iter_records(
+                DataFormat.NDJSON, _chunks(b'{"title": "a"}\n{"title": "b"}\n')
+            ),
+            batch_size=1,
+        )
+
+    assert report.batches[0].error == "boom"
+    assert report.inserted == 1
+    db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_copy_rows_uses_asyncpg_copy():
+    db = AsyncMock()
+    driver = AsyncMock()
+    raw = MagicMock(driver_connection=driver)
+    db.connection.return_value.get_raw_connection = AsyncMock(return_value=raw)
+    rows = [(uuid.uuid4(), "a", None, "CREATED")]
+
+    await TaskRepository(db).copy_rows(rows)
+
+    driver.copy_records_to_table.assert_awaited_once_with(
+        "tasks", records=rows, columns=COPY_COLUMNS
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint_streams_body_to_service():
+    app = get_application()
+
+    async def override_get_db():
+        yield AsyncMock(name="DummySession")
+
+    app.dependency_overrides[get_async_session] = override_get_db
+    service = MagicMock()
+    seen = []
+
+    async def import_tasks(records, batch_size):
+        assert batch_size is None
+        seen.extend([r async for r in records])
+        return TaskImportReport(rows=len(seen), inserted=len(seen))
+
+    service.import_tasks = import_tasks
+
+    with patch("app.api.v1.tasks.TaskService", return_value=service):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            resp = await client.post(
+                "/api/v1/tasks/import?format=csv",
+                content=b"title\nfirst\nsecond\n",
+                headers={"Content-Type": "text/csv"},
+            )
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["inserted"] == 2
+    assert seen == [(2, {"title": "first"}), (3, {"title": "second"})]
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint_limits_batch_size():
+    app = get_application()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            f"/api/v1/tasks/import?batch_size={MAX_IMPORT_BATCH_SIZE + 1}",
+            content=b"",
+        )
+
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.db import engine
+from app.db.pool import (
+    InstrumentedAsyncQueuePool,
+    _hold_observer,
+    _on_checkout,
+    instrument_pool,
+)
+
+
+def _sample(name: str, engine_name: str = "test") -> float:
+    return REGISTRY.get_sample_value(name, {"engine": engine_name}) or 0.0
+
+
+def _pool(**kwargs) -> InstrumentedAsyncQueuePool:
+    pool = InstrumentedAsyncQueuePool(MagicMock, **kwargs)
+    pool.metrics_name = "test"
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(pool, "checkin", _hold_observer("test"))
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_pool_records_wait_and_hold_time():
+    pool = _pool(pool_size=1, max_overflow=0)
+    waits = _sample("app_db_pool_wait_seconds_count")
+    holds = _sample("app_db_pool_hold_seconds_count")
+
+    def use_connection():
+        connection = pool.connect()
+        connection.close()
+
+    await greenlet_spawn(use_connection)
+
+    assert _sample("app_db_pool_wait_seconds_count") == waits + 1
+    assert _sample("app_db_pool_hold_seconds_count") == holds + 1
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkout_timeouts():
+    pool = _pool(pool_size=1, max_overflow=0, timeout=0.01)
+    timeouts = _sample("app_db_pool_timeouts_total")
+
+    def exhaust():
+        held = pool.connect()
+        try:
+            with pytest.raises(PoolTimeoutError):
+                pool.connect()
+        finally:
+            held.close()
+
+    await greenlet_spawn(exhaust)
+
+    assert _sample("app_db_pool_timeouts_total") == timeouts + 1
+
+
+def test_engine_uses_configured_pool():
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert engine.pool.metrics_name == "primary"
+    assert _sample("app_db_pool_size", "primary") == engine.pool.size()
+    assert _sample("app_db_pool_checked_out", "primary") == 0
+
+
+def test_instrumented_engines_are_labelled_separately():
+    replica = create_async_engine(
+        "postgresql+asyncpg://localhost/replica",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=3,
+    )
+    instrument_pool(replica, "replica_test")
+
+    assert _sample("app_db_pool_size", "replica_test") == 3
+    assert _sample("app_db_pool_size", "primary") == engine.pool.size()
+    assert replica.pool.recreate().metrics_name == "replica_test"
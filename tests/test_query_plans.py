@@ -0,0 +1,124 @@
+import itertools
+import json
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
+from app.repositories.task_repository import (
+    list_query,
+    search_query,
+    suggest_query,
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="Для проверки планов нужен Postgres в TEST_DATABASE_URL",
+)
+
+
+def _after(sort: TaskSortField) -> tuple:
+    if sort is TaskSortField.ID:
+        return (uuid.uuid4(),)
+    if sort is TaskSortField.TITLE:
+        return ("Задача", uuid.uuid4())
+    return (TaskStatus.IN_PROGRESS, uuid.uuid4())
+
+
+def _node_types(plan: dict):
+    yield plan["Node Type"]
+    for child in plan.get("Plans", []):
+        yield from _node_types(child)
+
+
+@pytest_asyncio.fixture
+async def conn():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        yield connection
+        await transaction.rollback()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "status, sort, order, with_cursor",
+    list(
+        itertools.product(
+            [None, TaskStatus.CREATED],
+            list(TaskSortField),
+            list(SortOrder),
+            [False, True],
+        )
+    ),
+)
+async def test_list_query_uses_index_without_sort(
+    conn, status, sort, order, with_cursor
+):
+    stmt = list_query(
+        limit=20,
+        after=_after(sort) if with_cursor else None,
+        status=status,
+        sort=sort,
+        order=order,
+    )
+    sql = str(
+        stmt.compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = set(_node_types(plan[0]["Plan"]))
+
+    assert "Seq Scan" not in nodes, sql
+    assert "Sort" not in nodes, sql
+    assert "Incremental Sort" not in nodes, sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fuzzy", [False, True])
+async def test_search_query_uses_index(conn, fuzzy):
+    stmt = search_query(["отчёт"], limit=20, fuzzy=fuzzy)
+    sql = str(
+        stmt.compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    assert "Seq Scan" not in set(_node_types(plan[0]["Plan"])), sql
+
+
+@pytest.mark.asyncio
+async def test_suggest_query_reads_prefix_range_from_index(conn):
+    sql = str(
+        suggest_query("зад", 10).compile(
+            dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodes = set(_node_types(plan[0]["Plan"]))
+
+    assert "Seq Scan" not in nodes, sql
+    assert "Sort" not in nodes, sql
@@ -0,0 +1,178 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+
+from app.db.db import ReadSessionLocal, engine
+from app.db.replicas import (
+    PRIMARY_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    ReplicaSession,
+    prefers_primary,
+)
+from app.services.task_service import TaskService
+from app.utils.cache import LRUCache
+
+
+def _factory(name: str, error: Exception | None = None) -> MagicMock:
+    session = AsyncMock(name=name)
+    session.__aenter__.return_value = session
+    if error is not None:
+        session.connection.side_effect = error
+    return MagicMock(name=f"{name}_factory", return_value=session)
+
+
+async def _used(router: ReplicaRouter, **kwargs) -> str:
+    async with router.session(**kwargs) as session:
+        return session._extract_mock_name()
+
+
+@pytest.mark.asyncio
+async def test_router_round_robins_replicas():
+    router = ReplicaRouter(
+        _factory("primary"),
+        [_factory("r0"), _factory("r1")],
+        cooldown=5,
+    )
+
+    assert [await _used(router) for _ in range(3)] == ["r0", "r1", "r0"]
+    assert await _used(router, primary=True) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_router_skips_unhealthy_replica_until_cooldown():
+    broken = _factory("r0", error=OSError("connection refused"))
+    router = ReplicaRouter(
+        _factory("primary"), [broken, _factory("r1")], cooldown=60
+    )
+
+    assert [await _used(router) for _ in range(3)] == ["r1", "r1", "r1"]
+    assert broken.call_count == 1
+    broken.return_value.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_primary():
+    router = ReplicaRouter(
+        _factory("primary"),
+        [_factory("r0", error=OSError("connection refused"))],
+        cooldown=60,
+    )
+
+    assert await _used(router) == "primary"
+    assert await _used(router) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_router_marks_replica_down_on_disconnect_during_query():
+    router = ReplicaRouter(
+        _factory("primary"), [_factory("r0"), _factory("r1")], cooldown=60
+    )
+    lost = DBAPIError("SELECT 1", None, OSError("closed"))
+    lost.connection_invalidated = True
+
+    with pytest.raises(DBAPIError):
+        async with router.session():
+            raise lost
+    with pytest.raises(DBAPIError):
+        async with router.session():
+            raise DBAPIError("SELECT 1", None, ValueError("bad query"))
+
+    assert [await _used(router) for _ in range(2)] == ["r1", "r1"]
+
+
+def test_prefers_primary_reads_cookie_deadline():
+    def request(cookie: str | None) -> Request:
+        headers = [(b"cookie", cookie.encode())] if cookie else []
+        return Request({"type": "http", "headers": headers})
+
+    assert prefers_primary(request(f"{PRIMARY_COOKIE}={time.time() + 5}"))
+    assert not prefers_primary(request(f"{PRIMARY_COOKIE}={time.time() - 1}"))
+    assert not prefers_primary(request(f"{PRIMARY_COOKIE}=garbage"))
+    assert not prefers_primary(request(None))
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_cookie_after_successful_write():
+    app = FastAPI()
+
+    @app.post("/ok")
+    async def ok():
+        return {}
+
+    @app.post("/fail")
+    async def fail():
+        raise HTTPException(status_code=400)
+
+    @app.get("/read")
+    async def read():
+        return {}
+
+    @app.post("/lookup")
+    async def lookup():
+        return {}
+
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window=5,
+        read_only_paths=frozenset({"/lookup"}),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        written = await client.post("/ok")
+        failed = await client.post("/fail")
+        read = await client.get("/read")
+        looked_up = await client.post("/lookup")
+
+    assert float(written.cookies[PRIMARY_COOKIE]) > time.time()
+    assert "set-cookie" not in failed.headers
+    assert "set-cookie" not in read.headers
+    assert "set-cookie" not in looked_up.headers
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_task_cache():
+    repo = AsyncMock()
+    repo.get.return_value = MagicMock()
+    cache = LRUCache("test_replica", maxsize=10, ttl=60)
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(ReplicaSession(), cache=cache)
+        assert svc.from_replica
+        await svc.get(MagicMock())
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_router_applies_isolation_level_override():
+    primary = _factory("primary")
+    replica = _factory("r0")
+    router = ReplicaRouter(primary, [replica], cooldown=5)
+    options = {"isolation_level": "REPEATABLE READ"}
+
+    await _used(router, isolation_level="REPEATABLE READ")
+    await _used(router, primary=True, isolation_level="REPEATABLE READ")
+
+    replica.return_value.connection.assert_awaited_once_with(
+        execution_options=options
+    )
+    primary.return_value.connection.assert_awaited_once_with(
+        execution_options=options
+    )
+
+
+def test_read_sessions_run_without_transaction():
+    bind = ReadSessionLocal.kw["bind"]
+
+    assert bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    assert bind.pool is engine.pool
+    assert "isolation_level" not in engine.get_execution_options()
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "row"
+
+    waiters = [asyncio.create_task(flight.do("k", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["row"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately_and_errors_propagate():
+    flight = SingleFlight("test")
+
+    async def fail():
+        raise RuntimeError("db down")
+
+    async def ok():
+        return 1
+
+    with pytest.raises(RuntimeError):
+        await flight.do("a", fail)
+    assert await flight.do("b", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_retries_when_leader_is_cancelled():
+    flight = SingleFlight("test")
+    started = asyncio.Event()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "fresh"
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("k", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "fresh"
+    assert calls == 1
@@ -0,0 +1,117 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from sqlalchemy.dialects import postgresql
+from starlette import status
+
+from app.db.db import get_async_session
+from app.db.enums import TaskStatus
+from app.main import get_application
+from app.models.task import Task
+
+
+class RecordingSession:
+    """Подмена AsyncSession, которая считает отправленные в БД запросы."""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def _record(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+    async def scalar(self, stmt):
+        self._record(stmt)
+        return self.result
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def make_client():
+    def factory(session: RecordingSession) -> AsyncClient:
+        app = get_application()
+
+        async def override_get_db():
+            yield session
+
+        app.dependency_overrides[get_async_session] = override_get_db
+        return AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        )
+
+    return factory
+
+
+def _task(**kwargs) -> Task:
+    values = {
+        "id": uuid.uuid4(),
+        "title": "Задача",
+        "description": None,
+        "status": TaskStatus.CREATED,
+    }
+    values.update(kwargs)
+    return Task(**values)
+
+
+@pytest.mark.asyncio
+async def test_create_is_one_statement(make_client):
+    session = RecordingSession(_task(title="Новая"))
+
+    async with make_client(session) as client:
+        resp = await client.post("/api/v1/tasks/", json={"title": "Новая"})
+
+    assert resp.status_code == status.HTTP_201_CREATED
+    assert len(session.statements) == 1
+    assert session.statements[0].startswith("INSERT INTO tasks")
+    assert "RETURNING" in session.statements[0]
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_is_one_statement(make_client):
+    task = _task(title="Новое имя")
+    session = RecordingSession(task)
+
+    async with make_client(session) as client:
+        resp = await client.patch(
+            f"/api/v1/tasks/{task.id}", json={"title": "Новое имя"}
+        )
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert len(session.statements) == 1
+    assert session.statements[0].startswith("UPDATE tasks SET title=")
+    assert "RETURNING" in session.statements[0]
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_missing_task_is_one_statement(make_client):
+    session = RecordingSession(None)
+
+    async with make_client(session) as client:
+        resp = await client.patch(
+            f"/api/v1/tasks/{uuid.uuid4()}", json={"title": "X"}
+        )
+
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+    assert len(session.statements) == 1
+    assert session.commits == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_is_one_statement(make_client):
+    task_id = uuid.uuid4()
+    session = RecordingSession(task_id)
+
+    async with make_client(session) as client:
+        resp = await client.delete(f"/api/v1/tasks/{task_id}")
+
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+    assert len(session.statements) == 1
+    assert session.statements[0].startswith("DELETE FROM tasks")
+    assert session.commits == 1
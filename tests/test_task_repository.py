@@ -1,24 +1,42 @@
 import uuid
+from collections import namedtuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
 from app.models.task import Task
-from app.repositories.task_repository import TaskRepository
+from app.repositories.task_repository import (
+    READ_COLUMNS,
+    TaskRepository,
+    TaskRow,
+    prefix_upper_bound,
+)
+from app.schemas.task import TaskOut
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
 
 
 @pytest.mark.asyncio
-async def test_create_calls_db_methods():
+async def test_create_is_single_insert_returning():
     db = AsyncMock(spec=AsyncSession)
     repo = TaskRepository(db)
     task = Task(title="Test", description="Desc", status="created")
+    db.scalar.return_value = task
 
-    out = await repo.create(task)
+    out = await repo.create({"title": "Test", "description": "Desc"})
 
-    db.add.assert_called_once_with(task)
-    db.flush.assert_called_once()
-    db.refresh.assert_called_once_with(task)
+    db.scalar.assert_awaited_once()
+    sql = _sql(db.scalar.call_args.args[0])
+    assert sql.startswith("INSERT INTO tasks")
+    assert "RETURNING" in sql
+    db.add.assert_not_called()
+    db.flush.assert_not_called()
+    db.refresh.assert_not_called()
     assert out is task
 
 
@@ -40,33 +58,353 @@ async def test_list_executes_select_and_returns_tasks():
     db = AsyncMock(spec=AsyncSession)
     repo = TaskRepository(db)
 
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = ["task1", "task2"]
-
-    db.execute.return_value = mock_result
+    row = (uuid.uuid4(), "Задача", TaskStatus.CREATED, 1, "Описание")
+    db.execute.return_value = MagicMock(
+        __iter__=MagicMock(return_value=iter([row]))
+    )
 
     out = await repo.list(offset=5, limit=10)
     db.execute.assert_called_once()
-    assert out == ["task1", "task2"]
+    assert [type(t) for t in out] == [TaskRow]
+    assert (out[0].id, out[0].version) == (row[0], 1)
+    assert out[0].description == "Описание"
+    sql = _sql(db.execute.call_args.args[0])
+    assert sql.startswith(
+        "SELECT tasks.id, tasks.title, tasks.status, tasks.version, "
+        "tasks.description \nFROM tasks"
+    )
 
 
 @pytest.mark.asyncio
-async def test_update_calls_db_methods():
+async def test_update_sets_only_given_fields_with_returning():
     db = AsyncMock(spec=AsyncSession)
     repo = TaskRepository(db)
-    task = Task(title="Old", description="Old", status="created")
-    out = await repo.update(task)
+    task = Task(title="New", description="Old", status="created")
+    db.scalar.return_value = task
 
-    db.add.assert_called_once_with(task)
-    db.flush.assert_called_once()
-    db.refresh.assert_called_once_with(task)
+    out = await repo.update(uuid.uuid4(), {"title": "New"})
+
+    sql = _sql(db.scalar.call_args.args[0])
+    assert "SET title=" in sql
+    assert "description" not in sql.split("RETURNING")[0]
+    assert "WHERE tasks.id = " in sql
+    assert "RETURNING" in sql
+    db.flush.assert_not_called()
     assert out is task
 
 
 @pytest.mark.asyncio
-async def test_delete_calls_db_delete():
+async def test_delete_is_single_delete_returning():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    task_id = uuid.uuid4()
+    db.scalar.return_value = task_id
+
+    assert await repo.delete(task_id) is True
+
+    sql = _sql(db.scalar.call_args.args[0])
+    assert sql.startswith("DELETE FROM tasks WHERE tasks.id = ")
+    assert sql.endswith("RETURNING tasks.id")
+    db.get.assert_not_called()
+    db.delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_returns_false():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalar.return_value = None
+
+    assert await repo.delete(uuid.uuid4()) is False
+
+
+@pytest.mark.asyncio
+async def test_delete_many_binds_ids_as_one_array():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    db.scalars.return_value.all = MagicMock(return_value=ids[:1])
+
+    out = await repo.delete_many(ids)
+
+    stmt = db.scalars.call_args.args[0]
+    assert "tasks.id = ANY (" in _sql(stmt)
+    assert list(stmt.compile().params.values()) == [ids]
+    assert out == ids[:1]
+
+
+@pytest.mark.asyncio
+async def test_list_after_seeks_on_primary_key():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.execute.return_value = MagicMock()
+
+    await repo.list(limit=10, after=(uuid.uuid4(),))
+
+    sql = str(
+        db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "WHERE tasks.id > " in sql
+    assert "ORDER BY tasks.id" in sql
+    assert "OFFSET" not in sql
+
+
+@pytest.mark.asyncio
+async def test_list_filters_and_seeks_on_composite_sort_key():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.execute.return_value = MagicMock()
+
+    await repo.list(
+        limit=10,
+        after=("Задача", uuid.uuid4()),
+        status=TaskStatus.CREATED,
+        sort=TaskSortField.TITLE,
+        order=SortOrder.DESC,
+    )
+
+    sql = str(
+        db.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "tasks.status = " in sql
+    assert "(tasks.title, tasks.id) < (" in sql
+    assert "ORDER BY tasks.title DESC, tasks.id DESC" in sql
+
+
+@pytest.mark.asyncio
+async def test_create_many_uses_insert_returning():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalars.return_value.all = MagicMock(return_value=["t1", "t2"])
+    rows = [{"title": "a"}, {"title": "b"}]
+
+    out = await repo.create_many(rows)
+
+    stmt, params = db.scalars.call_args.args
+    assert params == rows
+    assert "RETURNING" in _sql(stmt)
+    assert out == ["t1", "t2"]
+
+
+@pytest.mark.asyncio
+async def test_set_status_checks_expected_status_in_same_update():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalars.return_value.all = MagicMock(return_value=[])
+
+    await repo.set_status(
+        TaskStatus.IN_PROGRESS,
+        ids=[uuid.uuid4()],
+        expected_status=TaskStatus.CREATED,
+    )
+
+    sql = _sql(db.scalars.call_args.args[0])
+    assert sql.startswith("UPDATE tasks SET status=")
+    assert "tasks.id = ANY (" in sql
+    assert "AND tasks.status = " in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_set_status_without_ids_is_limited():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalars.return_value.all = MagicMock(return_value=[])
+
+    await repo.set_status(
+        TaskStatus.COMPLETED, expected_status=TaskStatus.IN_PROGRESS, limit=10
+    )
+
+    sql = _sql(db.scalars.call_args.args[0])
+    assert "WHERE tasks.id IN (SELECT tasks.id" in sql
+    assert "LIMIT " in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "AND tasks.status = " in sql
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_rows():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalars.return_value.all = MagicMock(return_value=[])
+
+    await repo.claim(5)
+
+    sql = _sql(db.scalars.call_args.args[0])
+    assert sql.startswith("UPDATE tasks SET status=")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_version_selects_only_version():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.scalar.return_value = 2
+
+    assert await repo.get_version(uuid.uuid4()) == 2
+    sql = _sql(db.scalar.call_args.args[0])
+    assert sql.startswith("SELECT tasks.version \nFROM tasks")
+
+
+@pytest.mark.asyncio
+async def test_update_bumps_version():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+
+    await repo.update(uuid.uuid4(), {"title": "New"})
+
+    assert "version=(tasks.version + " in _sql(db.scalar.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_update_with_expected_version_is_conditional():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+
+    await repo.update(uuid.uuid4(), {"title": "New"}, expected_versions=[3])
+
+    sql = _sql(db.scalar.call_args.args[0])
+    assert "WHERE tasks.id = " in sql
+    assert "AND tasks.version IN " in sql
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_server_side_cursor_batches():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+
+    rows = [
+        (uuid.uuid4(), f"t{i}", TaskStatus.CREATED, 1, None) for i in (1, 2, 3)
+    ]
+
+    async def partitions():
+        yield rows[:2]
+        yield rows[2:]
+
+    db.stream.return_value.partitions = partitions
+
+    out = [batch async for batch in repo.stream(2)]
+
+    stmt = db.stream.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 2
+    assert list(stmt.selected_columns) == list(READ_COLUMNS)
+    assert [[t.title for t in batch] for batch in out] == [
+        ["t1", "t2"],
+        ["t3"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_prefixes_by_tsvector_and_ranks():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.execute.return_value = MagicMock()
+
+    await repo.search(["квартал", "отч"], limit=5, after=(0.5, uuid.uuid4()))
+
+    stmt = db.execute.call_args.args[0]
+    sql = _sql(stmt)
+    assert "tasks.search_vector @@ to_tsquery(" in sql
+    assert "ts_rank(tasks.search_vector" in sql
+    assert "ORDER BY rank DESC, tasks.id DESC" in sql
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert "квартал:* & отч:*" in params.values()
+
+
+@pytest.mark.asyncio
+async def test_search_fuzzy_uses_trigram_operator():
     db = AsyncMock(spec=AsyncSession)
     repo = TaskRepository(db)
-    task = Task(title="Old", description="Old", status="created")
-    await repo.delete(task)
-    db.delete.assert_called_once_with(task)
+    db.execute.return_value = MagicMock()
+
+    await repo.search(["отчт"], fuzzy=True)
+
+    sql = _sql(db.execute.call_args.args[0])
+    assert "WHERE tasks.title %%> " in sql
+    assert "word_similarity(" in sql
+    assert "@@" not in sql
+
+
+@pytest.mark.asyncio
+async def test_suggest_scans_title_prefix_range():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    db.execute.return_value = MagicMock()
+
+    await repo.suggest("зад", 5)
+
+    stmt = db.execute.call_args.args[0]
+    sql = _sql(stmt)
+    assert sql.startswith("SELECT tasks.id, tasks.title \nFROM tasks")
+    assert '(lower(tasks.title) COLLATE "C") >= ' in sql
+    assert '(lower(tasks.title) COLLATE "C") < ' in sql
+    assert 'ORDER BY lower(tasks.title) COLLATE "C", tasks.id' in sql
+    assert "LIKE" not in sql
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert {"зад", "зае"} <= set(params.values())
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("abc") == "abd"
+    assert prefix_upper_bound("a\U0010ffff") == "b"
+    assert prefix_upper_bound("\ud7ff") == "\ue000"
+    assert prefix_upper_bound("\U0010ffff") is None
+
+
+@pytest.mark.asyncio
+async def test_search_returns_task_rows_with_rank():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    task_id = uuid.uuid4()
+    columns = [column.key for column in READ_COLUMNS]
+    row = namedtuple("SearchRow", [*columns, "rank"])(
+        task_id, "Отчёт", TaskStatus.CREATED, 2, None, 0.5
+    )
+    db.execute.return_value = MagicMock(
+        __iter__=MagicMock(return_value=iter([row]))
+    )
+
+    [(task, rank)] = await repo.search(["отчёт"])
+
+    assert TaskOut.model_validate(task).model_dump() == {
+        "id": task_id,
+        "title": "Отчёт",
+        "description": None,
+        "status": TaskStatus.CREATED,
+        "version": 2,
+    }
+    assert rank == 0.5
+
+
+@pytest.mark.asyncio
+async def test_list_and_get_row_can_skip_description():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    task_id = uuid.uuid4()
+    result = MagicMock()
+    result.first.return_value = (task_id, "Задача", TaskStatus.CREATED, 1)
+    db.execute.return_value = result
+
+    await repo.list(limit=10, description=False)
+    list_sql = _sql(db.execute.call_args.args[0])
+    task = await repo.get_row(task_id, description=False)
+    get_sql = _sql(db.execute.call_args.args[0])
+
+    assert "description" not in list_sql
+    assert "description" not in get_sql
+    assert "WHERE tasks.id = " in get_sql
+    assert (task.id, task.description) == (task_id, None)
+
+
+@pytest.mark.asyncio
+async def test_get_many_binds_ids_as_one_array():
+    db = AsyncMock(spec=AsyncSession)
+    repo = TaskRepository(db)
+    ids = [uuid.uuid4(), uuid.uuid4()]
+
+    await repo.get_many(ids)
+
+    stmt = db.execute.call_args.args[0]
+    assert "WHERE tasks.id = ANY (" in _sql(stmt)
+    assert list(stmt.compile().params.values()) == [ids]
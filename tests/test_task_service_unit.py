@@ -1,15 +1,30 @@
+import asyncio
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.db.enums import TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate
-from app.services.task_service import TaskService
+from app.core.constants import MAX_SUGGEST_LIMIT
+from app.db.enums import SortOrder, TaskSortField, TaskStatus
+from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+from app.services.task_cache import task_cache_key
+from app.services.task_service import TaskService, VersionConflictError
+from app.utils.cache import LRUCache
+from app.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_global_task_cache():
+    with patch("app.services.task_service.get_task_cache", return_value=None):
+        yield
 
 
 @pytest.mark.asyncio
-async def test_service_create_commits_and_refreshes():
+async def test_service_create_commits_without_refresh():
     db = AsyncMock()
     repo = AsyncMock()
 
@@ -29,8 +44,11 @@ async def test_service_create_commits_and_refreshes():
     assert out.title == "t"
     assert out.description == "d"
     assert out.status == TaskStatus.CREATED
+    repo.create.assert_called_once_with(
+        {"title": "t", "description": "d", "status": TaskStatus.CREATED}
+    )
     db.commit.assert_awaited_once()
-    db.refresh.assert_awaited_once()
+    db.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -59,60 +77,54 @@ async def test_service_list_calculates_offset_and_limit():
         items = await svc.list(page=3, page_size=5)
 
     assert items == ["A", "B"]
-    repo.list.assert_called_once_with(offset=10, limit=5)
+    repo.list.assert_called_once_with(
+        offset=10,
+        limit=5,
+        status=None,
+        sort=TaskSortField.ID,
+        order=SortOrder.ASC,
+        description=True,
+    )
 
 
 @pytest.mark.asyncio
-async def test_service_update_found_changes_fields_and_commits():
+async def test_service_update_passes_only_provided_fields():
     db = AsyncMock()
     repo = AsyncMock()
-
-    class Obj:
-        def __init__(self):
-            self.title = "old"
-            self.description = "old"
-            self.status = TaskStatus.CREATED
-
-    obj = Obj()
-    repo.get.return_value = obj
+    task_id = uuid.uuid4()
+    obj = MagicMock()
     repo.update.return_value = obj
 
     with patch("app.services.task_service.TaskRepository", return_value=repo):
         svc = TaskService(db)
         out = await svc.update(
-            uuid.uuid4(),
+            task_id,
             TaskUpdate(
                 title="new", description=None, status=TaskStatus.COMPLETED
             ),
         )
 
-    assert out.title == "new"
-    assert out.description == "old"
-    assert out.status == TaskStatus.COMPLETED
+    assert out is obj
+    repo.update.assert_called_once_with(
+        task_id,
+        {"title": "new", "status": TaskStatus.COMPLETED},
+        expected_versions=None,
+    )
+    repo.get.assert_not_called()
     db.commit.assert_awaited_once()
-    db.refresh.assert_awaited_once()
-    repo.update.assert_called_once()
+    db.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_service_update_all_fields():
     db = AsyncMock()
     repo = AsyncMock()
-
-    class Obj:
-        def __init__(self):
-            self.title = "old"
-            self.description = "old"
-            self.status = TaskStatus.CREATED
-
-    obj = Obj()
-    repo.get.return_value = obj
-    repo.update.return_value = obj
+    task_id = uuid.uuid4()
 
     with patch("app.services.task_service.TaskRepository", return_value=repo):
         svc = TaskService(db)
-        out = await svc.update(
-            uuid.uuid4(),
+        await svc.update(
+            task_id,
             TaskUpdate(
                 title="new",
                 description="new desc",
@@ -120,19 +132,39 @@ async def test_service_update_all_fields():
             ),
         )
 
-    assert out.title == "new"
-    assert out.description == "new desc"
-    assert out.status == TaskStatus.COMPLETED
+    repo.update.assert_called_once_with(
+        task_id,
+        {
+            "title": "new",
+            "description": "new desc",
+            "status": TaskStatus.COMPLETED,
+        },
+        expected_versions=None,
+    )
     db.commit.assert_awaited_once()
-    db.refresh.assert_awaited_once()
-    repo.update.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_service_update_without_fields_only_reads():
+    db = AsyncMock()
+    repo = AsyncMock()
+    sentinel = object()
+    repo.get.return_value = sentinel
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        out = await svc.update(uuid.uuid4(), TaskUpdate())
+
+    assert out is sentinel
+    repo.update.assert_not_called()
+    db.commit.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_service_update_not_found_returns_none():
     db = AsyncMock()
     repo = AsyncMock()
-    repo.get.return_value = None
+    repo.update.return_value = None
 
     with patch("app.services.task_service.TaskRepository", return_value=repo):
         svc = TaskService(db)
@@ -147,17 +179,16 @@ async def test_service_update_not_found_returns_none():
 async def test_service_delete_found_commit_and_true():
     db = AsyncMock()
     repo = AsyncMock()
-
-    task = MagicMock()
-    repo.get.return_value = task
-    repo.delete.return_value = None
+    repo.delete.return_value = True
+    task_id = uuid.uuid4()
 
     with patch("app.services.task_service.TaskRepository", return_value=repo):
         svc = TaskService(db)
-        ok = await svc.delete(uuid.uuid4())
+        ok = await svc.delete(task_id)
 
     assert ok is True
-    repo.delete.assert_called_once()
+    repo.delete.assert_called_once_with(task_id)
+    repo.get.assert_not_called()
     db.commit.assert_awaited_once()
 
 
@@ -165,12 +196,419 @@ async def test_service_delete_found_commit_and_true():
 async def test_service_delete_not_found_returns_false():
     db = AsyncMock()
     repo = AsyncMock()
-    repo.get.return_value = None
+    repo.delete.return_value = False
 
     with patch("app.services.task_service.TaskRepository", return_value=repo):
         svc = TaskService(db)
         ok = await svc.delete(uuid.uuid4())
 
     assert ok is False
-    repo.delete.assert_not_called()
     db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_list_after_fetches_extra_row_for_has_next():
+    db = AsyncMock()
+    repo = AsyncMock()
+    rows = [MagicMock(id=uuid.uuid4()) for _ in range(3)]
+    repo.list.return_value = rows
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        items, cursor = await svc.list_after(page_size=2)
+
+    assert items == rows[:2]
+    assert decode_cursor(cursor) == {
+        "s": "id",
+        "o": "asc",
+        "k": [str(rows[1].id)],
+    }
+    repo.list.assert_called_once_with(
+        limit=3,
+        after=None,
+        status=None,
+        sort=TaskSortField.ID,
+        order=SortOrder.ASC,
+        description=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_service_list_after_decodes_cursor_and_stops_on_last_page():
+    db = AsyncMock()
+    repo = AsyncMock()
+    last_id = uuid.uuid4()
+    repo.list.return_value = ["A"]
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        items, cursor = await svc.list_after(
+            cursor=encode_cursor(
+                {"s": "title", "o": "desc", "k": ["Задача", str(last_id)]}
+            ),
+            page_size=2,
+            status=TaskStatus.CREATED,
+            sort=TaskSortField.TITLE,
+            order=SortOrder.DESC,
+        )
+
+    assert items == ["A"]
+    assert cursor is None
+    repo.list.assert_called_once_with(
+        limit=3,
+        after=("Задача", last_id),
+        status=TaskStatus.CREATED,
+        sort=TaskSortField.TITLE,
+        order=SortOrder.DESC,
+        description=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_service_list_after_encodes_status_key_by_name():
+    repo = AsyncMock()
+    rows = [
+        MagicMock(id=uuid.uuid4(), status=TaskStatus.IN_PROGRESS)
+        for _ in range(2)
+    ]
+    repo.list.return_value = rows
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock())
+        _, cursor = await svc.list_after(
+            page_size=1, sort=TaskSortField.STATUS
+        )
+        await svc.list_after(
+            cursor=cursor, page_size=1, sort=TaskSortField.STATUS
+        )
+
+    assert decode_cursor(cursor)["k"] == ["IN_PROGRESS", str(rows[0].id)]
+    assert repo.list.call_args.kwargs["after"] == (
+        TaskStatus.IN_PROGRESS,
+        rows[0].id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_service_list_after_rejects_cursor_of_other_sort():
+    cursor = encode_cursor({"s": "id", "o": "asc", "k": [str(uuid.uuid4())]})
+
+    with patch("app.services.task_service.TaskRepository"):
+        svc = TaskService(AsyncMock())
+        with pytest.raises(InvalidCursorError):
+            await svc.list_after(cursor=cursor, sort=TaskSortField.TITLE)
+        with pytest.raises(InvalidCursorError):
+            await svc.list_after(cursor=cursor, order=SortOrder.DESC)
+
+
+@pytest.mark.asyncio
+async def test_service_list_after_rejects_malformed_cursor():
+    wrong_types = encode_cursor({"s": "id", "o": "asc", "k": [1]})
+
+    with patch("app.services.task_service.TaskRepository"):
+        svc = TaskService(AsyncMock())
+        with pytest.raises(InvalidCursorError):
+            await svc.list_after(cursor="not-a-cursor")
+        with pytest.raises(InvalidCursorError):
+            await svc.list_after(cursor=wrong_types)
+
+
+@pytest.mark.asyncio
+async def test_service_create_many_batches_in_one_transaction():
+    db = AsyncMock()
+    repo = AsyncMock()
+    repo.create_many.side_effect = lambda rows: [r["title"] for r in rows]
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        out = await svc.create_many(
+            [TaskCreate(title=str(i)) for i in range(5)], batch_size=2
+        )
+
+    assert out == ["0", "1", "2", "3", "4"]
+    assert [len(c.args[0]) for c in repo.create_many.call_args_list] == [
+        2,
+        2,
+        1,
+    ]
+    db.commit.assert_awaited_once()
+
+
+def _task_out(task_id: uuid.UUID) -> TaskOut:
+    return TaskOut(id=task_id, title="t", status=TaskStatus.CREATED)
+
+
+@pytest.mark.asyncio
+async def test_service_get_reads_through_cache():
+    db = AsyncMock()
+    repo = AsyncMock()
+    task_id = uuid.uuid4()
+    repo.get.return_value = _task_out(task_id)
+    cache = LRUCache("test", maxsize=10, ttl=60)
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db, cache=cache)
+        first = await svc.get(task_id)
+        second = await svc.get(task_id)
+
+    assert first == second == _task_out(task_id)
+    repo.get.assert_called_once_with(task_id)
+    assert await cache.get(task_cache_key(task_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_service_writes_invalidate_cache():
+    db = AsyncMock()
+    repo = AsyncMock()
+    ids = [uuid.uuid4() for _ in range(3)]
+    cache = LRUCache("test", maxsize=10, ttl=60)
+    for task_id in ids:
+        await cache.set(task_cache_key(task_id), b"{}")
+    repo.update.return_value = _task_out(ids[0])
+    repo.delete.return_value = True
+    repo.delete_many.return_value = [ids[2]]
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db, cache=cache)
+        await svc.update(ids[0], TaskUpdate(title="x"))
+        await svc.delete(ids[1])
+        await svc.delete_many(ids[2:])
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_service_read_racing_write_does_not_refill_cache():
+    repo = AsyncMock()
+    task_id = uuid.uuid4()
+    cache = LRUCache("test", maxsize=10, ttl=60)
+    snapshot_taken = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_get(_):
+        snapshot_taken.set()
+        await release.wait()
+        return _task_out(task_id)
+
+    repo.get.side_effect = slow_get
+    repo.update.return_value = _task_out(task_id)
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        read = asyncio.create_task(
+            TaskService(AsyncMock(), cache).get(task_id)
+        )
+        await snapshot_taken.wait()
+        await TaskService(AsyncMock(), cache=cache).update(
+            task_id, TaskUpdate(title="x")
+        )
+        release.set()
+        await read
+
+    assert await cache.get(task_cache_key(task_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_service_concurrent_gets_issue_one_select():
+    repo = AsyncMock()
+    task_id = uuid.uuid4()
+    release = asyncio.Event()
+
+    async def slow_get(_):
+        await release.wait()
+        return _task_out(task_id)
+
+    repo.get.side_effect = slow_get
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        services = [TaskService(AsyncMock()) for _ in range(3)]
+        reads = [asyncio.create_task(svc.get(task_id)) for svc in services]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*reads)
+
+    assert results == [_task_out(task_id)] * 3
+    repo.get.assert_called_once_with(task_id)
+
+
+@pytest.mark.asyncio
+async def test_service_get_version_prefers_cache():
+    repo = AsyncMock()
+    task_id = uuid.uuid4()
+    cache = LRUCache("test", maxsize=10, ttl=60)
+    cached = TaskOut(
+        id=task_id, title="t", status=TaskStatus.CREATED, version=7
+    )
+    await cache.set(task_cache_key(task_id), cached.model_dump_json())
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock(), cache=cache)
+        assert await svc.get_version(task_id) == 7
+        repo.get_version.return_value = 2
+        assert await svc.get_version(uuid.uuid4()) == 2
+
+    repo.get_version.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_service_update_version_mismatch_raises_conflict():
+    db = AsyncMock()
+    repo = AsyncMock()
+    repo.update.return_value = None
+    repo.get_version.return_value = 5
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(db)
+        with pytest.raises(VersionConflictError):
+            await svc.update(
+                uuid.uuid4(), TaskUpdate(title="x"), expected_versions=[4]
+            )
+
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_update_with_version_missing_task_returns_none():
+    repo = AsyncMock()
+    repo.update.return_value = None
+    repo.get_version.return_value = None
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock())
+        out = await svc.update(
+            uuid.uuid4(), TaskUpdate(title="x"), expected_versions=[4]
+        )
+
+    assert out is None
+
+
+@pytest.mark.asyncio
+async def test_service_search_pages_by_rank_and_id():
+    repo = AsyncMock()
+    rows = [(MagicMock(id=uuid.uuid4()), 1.0 - i / 10) for i in range(3)]
+    repo.search.return_value = rows
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock())
+        items, cursor = await svc.search("Отчёт, квартал!", page_size=2)
+        await svc.search("Отчёт, квартал!", cursor=cursor, page_size=2)
+
+    assert items == [rows[0][0], rows[1][0]]
+    first, second = repo.search.call_args_list
+    assert first.args == (["отчёт", "квартал"],)
+    assert first.kwargs == {"limit": 3}
+    assert second.kwargs == {
+        "limit": 3,
+        "after": (0.9, rows[1][0].id),
+        "fuzzy": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_service_search_falls_back_to_fuzzy_match():
+    repo = AsyncMock()
+    task = MagicMock(id=uuid.uuid4())
+    repo.search.side_effect = [[], [(task, 0.6)]]
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock())
+        items, cursor = await svc.search("отчт")
+
+    assert items == [task]
+    assert cursor is None
+    assert repo.search.call_args.kwargs["fuzzy"] is True
+
+
+@pytest.mark.asyncio
+async def test_service_search_rejects_cursor_of_other_query():
+    cursor = encode_cursor(
+        {"q": "a", "m": "fts", "k": [0.1, str(uuid.uuid4())]}
+    )
+
+    with patch("app.services.task_service.TaskRepository") as repo_cls:
+        svc = TaskService(AsyncMock())
+        with pytest.raises(InvalidCursorError):
+            await svc.search("b", cursor=cursor)
+        for key in ([0.1, 1], ["0.1", str(uuid.uuid4())]):
+            with pytest.raises(InvalidCursorError):
+                await svc.search(
+                    "a",
+                    cursor=encode_cursor({"q": "a", "m": "fts", "k": key}),
+                )
+        assert await svc.search("!!!") == ([], None)
+    repo_cls.return_value.search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_suggest_caches_short_prefixes():
+    repo = AsyncMock()
+    rows = [MagicMock(id=uuid.uuid4(), title=f"Задача {i}") for i in range(3)]
+    repo.suggest.return_value = rows
+    cache = LRUCache("test_suggest", maxsize=10, ttl=60)
+
+    with (
+        patch("app.services.task_service.TaskRepository", return_value=repo),
+        patch(
+            "app.services.task_service.get_suggest_cache", return_value=cache
+        ),
+    ):
+        svc = TaskService(AsyncMock())
+        first = await svc.suggest("ЗАД", limit=2)
+        second = await svc.suggest("зад", limit=3)
+
+    repo.suggest.assert_called_once_with("зад", MAX_SUGGEST_LIMIT)
+    assert [s.title for s in first] == ["Задача 0", "Задача 1"]
+    assert [s.id for s in second] == [r.id for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_service_suggest_skips_cache_for_long_prefixes():
+    repo = AsyncMock()
+    repo.suggest.return_value = []
+    cache = AsyncMock()
+
+    with (
+        patch("app.services.task_service.TaskRepository", return_value=repo),
+        patch(
+            "app.services.task_service.get_suggest_cache", return_value=cache
+        ),
+    ):
+        svc = TaskService(AsyncMock())
+        assert await svc.suggest("задача", limit=5) == []
+
+    repo.suggest.assert_called_once_with("задача", 5)
+    cache.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_get_without_description_skips_cache_fill():
+    repo = AsyncMock()
+    task_id = uuid.uuid4()
+    repo.get_row.return_value = _task_out(task_id)
+    cache = LRUCache("test_fields", maxsize=10, ttl=60)
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock(), cache=cache)
+        await svc.get(task_id, description=False)
+
+    repo.get_row.assert_awaited_once_with(task_id, description=False)
+    repo.get.assert_not_called()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_service_get_many_reads_misses_in_one_query():
+    repo = AsyncMock()
+    cached, loaded, missing = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    repo.get_many.return_value = [_task_out(loaded)]
+    cache = LRUCache("test_batch", maxsize=10, ttl=60)
+    await cache.set(
+        task_cache_key(cached), _task_out(cached).model_dump_json().encode()
+    )
+
+    with patch("app.services.task_service.TaskRepository", return_value=repo):
+        svc = TaskService(AsyncMock(), cache=cache)
+        found = await svc.get_many([cached, loaded, missing])
+
+    assert set(found) == {cached, loaded}
+    repo.get_many.assert_awaited_once_with([loaded, missing], description=True)
+    assert await cache.get(task_cache_key(loaded)) is not None
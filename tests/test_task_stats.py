@@ -0,0 +1,267 @@
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import anyio
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from sqlalchemy import create_mock_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.cli import main
+from app.db.base import Base
+from app.db.db import get_async_session, get_read_session
+from app.db.enums import TaskStatus, TotalMode
+from app.main import get_application
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.schemas.task import TaskStats
+from app.services.task_stats_service import TaskStatsService
+from app.utils.cache import LRUCache
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_counts_reads_only_counter_table():
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = MagicMock(
+        all=MagicMock(return_value=[(TaskStatus.CREATED, 5)])
+    )
+
+    counts = await TaskStatsRepository(db).counts()
+
+    assert counts == {TaskStatus.CREATED: 5}
+    sql = _sql(db.execute.call_args.args[0])
+    assert "FROM task_status_counts" in sql
+    assert "sum(task_status_counts.count)" in sql
+
+
+@pytest.mark.asyncio
+async def test_add_is_additive_upsert():
+    db = AsyncMock(spec=AsyncSession)
+
+    await TaskStatsRepository(db).add({TaskStatus.COMPLETED: -2})
+
+    sql = _sql(db.execute.call_args.args[0])
+    assert sql.startswith("INSERT INTO task_status_counts")
+    assert "ON CONFLICT (status, shard) DO UPDATE SET count = " in sql
+    assert "task_status_counts.count + excluded.count" in sql
+
+
+@pytest.mark.asyncio
+async def test_service_get_fills_missing_statuses():
+    repo = AsyncMock()
+    repo.counts.return_value = {TaskStatus.CREATED: 3, TaskStatus.COMPLETED: 4}
+
+    with patch(
+        "app.services.task_stats_service.TaskStatsRepository",
+        return_value=repo,
+    ):
+        stats = await TaskStatsService(AsyncMock()).get()
+
+    assert stats.total == 7
+    assert stats.by_status == {
+        TaskStatus.CREATED: 3,
+        TaskStatus.IN_PROGRESS: 0,
+        TaskStatus.COMPLETED: 4,
+    }
+
+
+@pytest.mark.asyncio
+async def test_service_reconcile_applies_drift_after_snapshot():
+    db = AsyncMock()
+    repo = AsyncMock()
+    repo.counts.return_value = {TaskStatus.CREATED: 3, TaskStatus.COMPLETED: 1}
+    repo.actual_counts.return_value = {
+        TaskStatus.CREATED: 3,
+        TaskStatus.IN_PROGRESS: 2,
+    }
+    events = MagicMock()
+    events.attach_mock(db.commit, "commit")
+    events.attach_mock(repo.add, "add")
+
+    with patch(
+        "app.services.task_stats_service.TaskStatsRepository",
+        return_value=repo,
+    ):
+        drift = await TaskStatsService(db).reconcile()
+
+    assert drift == {TaskStatus.IN_PROGRESS: 2, TaskStatus.COMPLETED: -1}
+    db.connection.assert_awaited_once_with(
+        execution_options={"isolation_level": "REPEATABLE READ"}
+    )
+    assert events.mock_calls == [
+        call.commit(),
+        call.add(drift),
+        call.commit(),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_reconcile_without_drift_writes_nothing():
+    db = AsyncMock()
+    repo = AsyncMock()
+    repo.counts.return_value = {TaskStatus.CREATED: 3}
+    repo.actual_counts.return_value = {TaskStatus.CREATED: 3}
+
+    with patch(
+        "app.services.task_stats_service.TaskStatsRepository",
+        return_value=repo,
+    ):
+        assert await TaskStatsService(db).reconcile() == {}
+
+    repo.add.assert_not_called()
+
+
+def test_stats_endpoint():
+    app = get_application()
+
+    async def override_get_db():
+        yield AsyncMock(name="DummySession")
+
+    app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    service = AsyncMock()
+    service.get.return_value = TaskStats(
+        total=1, by_status={TaskStatus.CREATED: 1}
+    )
+
+    async def request():
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await client.get("/api/v1/tasks/stats")
+
+    with patch("app.api.v1.tasks.TaskStatsService", return_value=service):
+        resp = anyio.run(request)
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json() == {"total": 1, "by_status": {"Создано": 1}}
+
+
+def test_cli_reconcile_stats(capsys):
+    with patch(
+        "app.cli.reconcile_stats",
+        new=AsyncMock(return_value={TaskStatus.COMPLETED: -1}),
+    ):
+        assert main(["reconcile-stats"]) == 0
+
+    assert "Завершено: поправка -1" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_estimate_unfiltered_uses_reltuples():
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.return_value = 1234.0
+
+    assert await TaskStatsRepository(db).estimate() == 1234
+
+    stmt, params = db.scalar.call_args.args
+    assert "FROM pg_class" in str(stmt)
+    assert params == {"table": "tasks"}
+
+
+@pytest.mark.asyncio
+async def test_estimate_filtered_uses_explain_rows():
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.return_value = '[{"Plan": {"Plan Rows": 42}}]'
+
+    repo = TaskStatsRepository(db)
+    assert await repo.estimate(TaskStatus.COMPLETED) == 42
+
+    sql = str(db.scalar.call_args.args[0])
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT tasks.id")
+    assert "WHERE tasks.status = 'COMPLETED'" in sql
+
+
+@pytest.mark.asyncio
+async def test_estimate_falls_back_to_explain_before_analyze():
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.side_effect = [-1.0, [{"Plan": {"Plan Rows": 7}}]]
+
+    assert await TaskStatsRepository(db).estimate() == 7
+    assert "EXPLAIN" in str(db.scalar.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_service_exact_total_is_cached_per_filter():
+    repo = AsyncMock()
+    repo.count.return_value = 10
+    cache = LRUCache("test_total", maxsize=10, ttl=60)
+
+    with (
+        patch(
+            "app.services.task_stats_service.TaskStatsRepository",
+            return_value=repo,
+        ),
+        patch(
+            "app.services.task_stats_service.get_total_cache",
+            return_value=cache,
+        ),
+    ):
+        svc = TaskStatsService(AsyncMock())
+        for _ in range(2):
+            assert await svc.total(TaskStatus.CREATED, TotalMode.EXACT) == 10
+        await svc.total(None, TotalMode.EXACT)
+        assert await svc.total(None, TotalMode.NONE) is None
+
+    assert repo.count.await_args_list == [
+        call(TaskStatus.CREATED),
+        call(None),
+    ]
+    repo.estimate.assert_not_called()
+
+
+def test_list_endpoint_with_estimated_total():
+    app = get_application()
+
+    async def override_get_db():
+        yield AsyncMock(name="DummySession")
+
+    app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    task_service = AsyncMock()
+    task_service.list_after.return_value = ([], None)
+    stats_service = AsyncMock()
+    stats_service.total.return_value = 1000
+
+    async def request():
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await client.get(
+                "/api/v1/tasks/?status=Завершено&with_total=estimate"
+            )
+
+    with (
+        patch("app.api.v1.tasks.TaskService", return_value=task_service),
+        patch("app.api.v1.tasks.TaskStatsService", return_value=stats_service),
+    ):
+        resp = anyio.run(request)
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()["total"] == 1000
+    assert resp.json()["total_estimated"] is True
+    stats_service.total.assert_awaited_once_with(
+        TaskStatus.COMPLETED, TotalMode.ESTIMATE
+    )
+
+
+def test_create_all_installs_counter_triggers():
+    statements = []
+    engine = create_mock_engine(
+        "postgresql+asyncpg://",
+        lambda sql, *_, **__: statements.append(
+            str(sql.compile(dialect=engine.dialect))
+        ),
+    )
+
+    Base.metadata.create_all(engine, checkfirst=False)
+
+    created = " ".join(statements)
+    assert "FUNCTION task_status_counts_apply()" in created
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        assert f"AFTER {event} ON tasks" in created